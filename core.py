@@ -15,8 +15,9 @@ import discord
 from discord.ext import commands
 
 import ext.flashscore as fs
+from ext.toonbot_utils.tm_client import TMClient, get_client
 
-from ext.utils.playwright_browser import make_browser
+from ext.utils.playwright_browser import make_browser, PagePool
 
 if TYPE_CHECKING:
     from playwright.async_api import BrowserContext
@@ -100,7 +101,9 @@ class Bot(commands.AutoShardedBot):
 
         # Session // Scraping
         self.browser: BrowserContext
+        self.page_pool: PagePool
         self.session: aiohttp.ClientSession
+        self.transfermarkt: TMClient
 
         # Announce aliveness
         started = self.initialised_at.strftime("%d-%m-%Y %H:%M:%S")
@@ -113,9 +116,11 @@ class Bot(commands.AutoShardedBot):
         # aiohttp
         cnt = aiohttp.TCPConnector(ssl=False)
         self.session = aiohttp.ClientSession(loop=self.loop, connector=cnt)
+        self.transfermarkt = get_client()
 
         # playwright
         self.browser = await make_browser()
+        self.page_pool = PagePool(self.browser)
 
         for i in COGS:
             try:
@@ -141,6 +146,7 @@ async def run() -> None:
             await bot.unload_extension(i)
 
         await bot.db.close()
+        await bot.transfermarkt.close()
 
         await bot.close()
 
@@ -8,11 +8,12 @@ from typing import TYPE_CHECKING, TypeAlias, Any
 
 import discord
 from discord import SelectOption, Embed, Colour
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ui import Select
 from discord.utils import escape_markdown
 
 from ext import wows_api as api
+from ext.wows_api.leaderboard import leaderboards
 from ext.utils import view_utils
 from ext.utils.timed_events import Timestamp
 
@@ -73,12 +74,13 @@ class Leaderboard(view_utils.DropdownPaginator):
 
         super().__init__(invoker, embed, rows, options)
         # Store so it can be accessed by dropdown
-        self.clans: list[api.ClanLeaderboardStats] = clans
+        self.by_id: dict[int, api.ClanLeaderboardStats]
+        self.by_id = {i.id: i for i in clans}
 
     @discord.ui.select(row=1, options=[], placeholder="View Clan")
     async def dropdown(self, itr: Interaction, sel: discord.ui.Select) -> None:
         """Push the latest version of the view to the user"""
-        clan = next(i for i in self.clans if str(i.id) in sel.values)
+        clan = self.by_id[int(sel.values[0])]
         region = next(i for i in api.Region if i.realm == clan.realm)
         clan_details = await api.get_clan_details(clan.id, region)
         view = ClanView(itr.user, clan_details, parent=self)
@@ -386,8 +388,19 @@ class Clans(commands.Cog):
 
     async def cog_load(self) -> None:
         """Fetch Clan Related Data on startup"""
-        self.bot.clan_battle_seasons = await api.get_cb_seasons()
+        # Seasons are loaded with the rest of the encyclopedia.
         self.bot.clan_battle_winners = await api.get_cb_winners()
+        self.ladder_loop.start()
+
+    async def cog_unload(self) -> None:
+        """Stop refreshing leaderboards"""
+        self.ladder_loop.cancel()
+
+    @tasks.loop(minutes=10)
+    async def ladder_loop(self) -> None:
+        """Keep the current season's leaderboards in memory"""
+        leaderboards.set_seasons(self.bot.clan_battle_seasons)
+        await leaderboards.refresh()
 
     clan = discord.app_commands.Group(
         name="clan",
@@ -425,15 +438,26 @@ class Clans(commands.Cog):
     @discord.app_commands.describe(
         region="Get Rankings for a specific region",
         season="Get rankings for a previous season",
+        league="Only show clans in this league",
+        tag="Find a clan by it's tag",
     )
     async def leaderboard(
         self,
         interaction: Interaction,
         region: api.region_transform,
         season: discord.app_commands.Range[int, 1, 20] | None = None,
+        league: api.League | None = None,
+        tag: str | None = None,
     ) -> None:
         """Get the Season Clan Battle Leaderboard"""
-        clans = await api.get_cb_leaderboard(region=region, season=season)
+        leaderboards.set_seasons(self.bot.clan_battle_seasons)
+        ladder = await leaderboards.get(season, region)
+        if tag is not None:
+            clans = ladder.find(tag)
+            if league is not None:
+                clans = [i for i in clans if i.league == league.value]
+        else:
+            clans = ladder.filter(league)
         seasons = interaction.client.clan_battle_seasons
         ssn = next((i for i in seasons if season == i.season_id), None)
         cln_view = Leaderboard(interaction.user, clans, ssn, region)
@@ -1,10 +1,14 @@
 """Tracker for the World of Warships Development Blog"""
 from __future__ import annotations
 
+import bisect
+import functools
 import logging
+import re
 from typing import TYPE_CHECKING, cast, TypeAlias, Literal
 
 import asyncio
+import asyncpg
 import discord
 from discord.abc import GuildChannel
 from discord.ext import commands, tasks
@@ -16,12 +20,117 @@ from ext.utils import view_utils, embed_utils
 
 if TYPE_CHECKING:
     from painezbot import PBot
+    from ext.utils.dispatcher import Send
 
     Interaction: TypeAlias = discord.Interaction[PBot]
     User: TypeAlias = discord.User | discord.Member
 
 logger = logging.getLogger("Devblog")
 
+BACKFILL_WORKERS = 4  # Missing blogs fetched at once
+TITLE_WEIGHT = 10  # A word in the title counts this many times in the text
+WORDS = re.compile(r"\w+")
+
+
+class BlogIndex:
+    """An inverted index of words in dev blog titles and text.
+
+    The last word of a query matches as a prefix, for autocomplete."""
+
+    def __init__(self) -> None:
+        self.blogs: dict[int, api.DevBlog] = dict()
+        # Word: {Blog ID: Weight}
+        self.postings: dict[str, dict[int, int]] = dict()
+        # Sorted, for prefix searching with bisect.
+        self.words: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.blogs)
+
+    def add(self, blog: api.DevBlog) -> None:
+        """Index a blog, replacing any previous version of it"""
+        self.remove(blog.id)
+        for word in self._add(blog):
+            bisect.insort(self.words, word)
+
+    def extend(self, blogs: list[api.DevBlog]) -> None:
+        """Index many blogs, sorting the vocabulary once at the end"""
+        for blog in blogs:
+            self._remove(blog.id)
+            self._add(blog)
+        self.words = sorted(self.postings)
+
+    def _add(self, blog: api.DevBlog) -> list[str]:
+        """Index a new blog, returning words not previously in the index"""
+        self.blogs[blog.id] = blog
+
+        weights: dict[str, int] = dict()
+        for word in WORDS.findall(f"{blog.id} {blog.title}".casefold()):
+            weights[word] = weights.get(word, 0) + TITLE_WEIGHT
+        for word in WORDS.findall(blog.text.casefold()):
+            weights[word] = weights.get(word, 0) + 1
+
+        new: list[str] = []
+        for word, weight in weights.items():
+            if (posting := self.postings.get(word)) is None:
+                posting = self.postings[word] = dict()
+                new.append(word)
+            posting[blog.id] = weight
+        return new
+
+    def remove(self, blog_id: int) -> None:
+        """Remove a blog from the index"""
+        for word in self._remove(blog_id):
+            del self.words[bisect.bisect_left(self.words, word)]
+
+    def _remove(self, blog_id: int) -> list[str]:
+        """Remove a blog, returning words no longer in the index"""
+        if self.blogs.pop(blog_id, None) is None:
+            return []
+
+        gone: list[str] = []
+        for word, posting in list(self.postings.items()):
+            if posting.pop(blog_id, None) is not None and not posting:
+                del self.postings[word]
+                gone.append(word)
+        return gone
+
+    def _prefixed(self, prefix: str) -> dict[int, int]:
+        """Combined postings of every word starting with prefix"""
+        out: dict[int, int] = dict()
+        start = bisect.bisect_left(self.words, prefix)
+        for word in self.words[start:]:
+            if not word.startswith(prefix):
+                break
+            for blog_id, weight in self.postings[word].items():
+                out[blog_id] = out.get(blog_id, 0) + weight
+        return out
+
+    def search(self, query: str) -> list[api.DevBlog]:
+        """Blogs containing every word of the query, best matches first"""
+        words = WORDS.findall(query.casefold())
+        if not words:
+            return sorted(self.blogs.values(), key=lambda i: -i.id)
+
+        scores: dict[int, int] | None = None
+        for num, word in enumerate(words):
+            if num == len(words) - 1:
+                posting = self._prefixed(word)
+            else:
+                posting = self.postings.get(word, {})
+
+            if scores is None:
+                scores = dict(posting)
+            else:
+                both = scores.keys() & posting.keys()
+                scores = {k: scores[k] + posting[k] for k in both}
+            if not scores:
+                return []
+
+        assert scores is not None
+        ranked = sorted(scores, key=lambda i: (scores[i], i), reverse=True)
+        return [self.blogs[i] for i in ranked]
+
 
 class BlogEmbed(discord.Embed):
     """Convert a Dev Blog to an Embed"""
@@ -304,29 +413,12 @@ class DevBlogView(view_utils.Paginator):
 async def db_ac(interaction: Interaction, current: str) -> list[Choice[str]]:
     """Autocomplete dev blog by text"""
 
-    cur = current.casefold()
-    dbc = cast(BlogCog, interaction.client.get_cog(BlogCog.__cog_name__)).cache
-    dbc.sort(key=lambda i: i.id, reverse=True)
+    cog = cast(BlogCog, interaction.client.get_cog(BlogCog.__cog_name__))
 
     choices: list[Choice[str]] = []
-    for i in dbc:
-        autocomplete = f"{i.id} {i.title} {i.text}".casefold()
-
-        if cur not in autocomplete:
-            continue
-
-        # If there's ever a description param on a choice ...
-        # bf, _, af = i.text.casefold().split(cur, maxsplit=1)
-
-        # lgth = 50 - (len(cur) / 2)
-        # text = f"{bf[lgth:]}{cur}{af[:lgth]}"[:100]
-
+    for i in cog.index.search(current)[:25]:
         name = f"{i.id}: {i.title}"[:100]
         choices.append(Choice(name=name, value=str(i.id)))
-
-        if len(choices) == 25:
-            break
-
     return choices
 
 
@@ -335,35 +427,49 @@ class BlogCog(commands.Cog):
 
     def __init__(self, bot: PBot):
         self.bot: PBot = bot
-        self.cache: list[api.DevBlog] = []
+        self.index: BlogIndex = BlogIndex()
         self.task: asyncio.Task[None] | None = None
+        # IDs of channels subscribed to new blogs
+        self.channels: set[int] = set()
 
     async def cog_load(self) -> None:
         await self.get_blogs()
+        sql = """SELECT channel_id FROM dev_blog_channels"""
+        records = await self.bot.db.fetch(sql, timeout=10)
+        self.channels = {r["channel_id"] for r in records}
         self.task = self.blog_loop.start()
 
     async def save_blog(self, blog: api.DevBlog) -> None:
         """Store cached inner text of a specific dev blog"""
-        async with self.bot.session.get(blog.url) as resp:
-            src = await resp.text()
-
-        tree = html.fromstring(src)
-        title = str(tree.xpath(".//title/text()")[0])
-        title = title.split(" - Development", maxsplit=1)[0]
-        blog.title = title
-
-        xpath = './/div[@class="article__content"]'
-        text = tree.xpath(xpath)[0].text_content()
-
-        if text:
-            logger.info("Storing Dev Blog #%s", blog.id)
-            blog.text = text
-        else:
+        # The parsed page is cached, so building the embed won't refetch.
+        await blog.fetch_text()
+        if not blog.text:
             return
+
+        logger.info("Storing Dev Blog #%s", blog.id)
         sql = """INSERT INTO dev_blogs (id, title, text) VALUES ($1, $2, $3)
                  ON CONFLICT DO NOTHING"""
-        await self.bot.db.execute(sql, blog.id, title, text, timeout=60)
-        self.cache.append(blog)
+        await self.bot.db.execute(
+            sql, blog.id, blog.title, blog.text, timeout=60
+        )
+        self.index.add(blog)
+
+    async def backfill(
+        self, blog_id: int, limit: asyncio.Semaphore
+    ) -> discord.Embed | None:
+        """Fetch, store, and build the embed for a new blog"""
+        blog = api.DevBlog(blog_id)
+        async with limit:
+            try:
+                await self.save_blog(blog)
+                return await BlogEmbed.create(blog)
+            except (ConnectionError, IndexError):
+                logger.error("Failed to fetch blog #%s", blog_id)
+                return None
+            except (asyncpg.PostgresError, asyncio.TimeoutError):
+                err = "Failed to store blog #%s"
+                logger.error(err, blog_id, exc_info=True)
+                return None
 
     async def cog_unload(self) -> None:
         """Stop previous runs of tickers upon Cog Reload"""
@@ -373,41 +479,42 @@ class BlogCog(commands.Cog):
     @tasks.loop(seconds=60)
     async def blog_loop(self) -> None:
         """Loop to get the latest dev blog articles"""
-        if not [cached := [int(r.id) for r in self.cache]]:
+        if not self.index:
             return
 
-        sql = """SELECT * FROM dev_blog_channels"""
-        for blog_id in await api.get_dev_blogs():
-            if blog_id in cached:
-                continue
-
-            logger.info("blog #%s not in cache", blog_id)
+        blogs = self.index.blogs
+        missing = [i for i in await api.get_dev_blogs() if i not in blogs]
+        if not missing:
+            return
 
-            blog = api.DevBlog(blog_id)
-            await self.save_blog(blog)
+        logger.info("blogs %s not in cache", missing)
+        limit = asyncio.Semaphore(BACKFILL_WORKERS)
+        embeds = await asyncio.gather(
+            *[self.backfill(i, limit) for i in missing]
+        )
 
-            embed = await BlogEmbed.create(blog)
+        for blog_id, embed in sorted(zip(missing, embeds)):
+            if embed is None:
+                continue
 
-            for r in await self.bot.db.fetch(sql, timeout=10):
-                channel = self.bot.get_channel(r["channel_id"])
+            sends: list[Send] = []
+            for channel_id in self.channels:
+                channel = self.bot.get_channel(channel_id)
                 if not isinstance(channel, discord.TextChannel):
                     continue
-
-                try:
-                    await channel.send(embed=embed)
-                except discord.HTTPException:
-                    logger.error("Failed to send blog", exc_info=True)
-                    continue
+                sends.append(functools.partial(channel.send, embed=embed))
+            self.bot.dispatcher.enqueue(f"Dev Blog #{blog_id}", sends)
 
     async def get_blogs(self) -> None:
         """Get a list of old dev blogs stored in DB"""
-        self.cache.clear()
         sql = """SELECT * FROM dev_blogs"""
         records = await self.bot.db.fetch(sql, timeout=10)
 
-        self.cache = [
-            api.DevBlog(r["id"], r["title"], r["text"]) for r in records
-        ]
+        index = BlogIndex()
+        index.extend(
+            [api.DevBlog(r["id"], r["title"], r["text"]) for r in records]
+        )
+        self.index = index
 
     @discord.app_commands.command()
     @discord.app_commands.default_permissions(manage_channels=True)
@@ -424,15 +531,17 @@ class BlogCog(commands.Cog):
         channel = cast(discord.TextChannel, interaction.channel)
         guild = cast(discord.Guild, interaction.guild)
 
-        if enabled:
+        if enabled == "off":
             sql = """DELETE FROM dev_blog_channels WHERE channel_id = $1"""
             await self.bot.db.execute(sql, channel.id, timeout=60)
+            self.channels.discard(channel.id)
             output = "New Dev Blogs will no longer be sent to this channel."
             colour = discord.Colour.red()
         else:
             sql = """INSERT INTO dev_blog_channels (channel_id, guild_id)
                    VALUES ($1, $2) ON CONFLICT DO NOTHING"""
             await self.bot.db.execute(sql, channel.id, guild.id, timeout=60)
+            self.channels.add(channel.id)
             output = "New Dev Blogs will now be sent to this channel."
             colour = discord.Colour.green()
 
@@ -450,13 +559,12 @@ class BlogCog(commands.Cog):
         """Fetch a World of Warships dev blog, either search for text or
         leave blank to get latest."""
         try:
-            blog = next(i for i in self.cache if i.id == int(search))
+            blog = self.index.blogs[int(search)]
             embed = await BlogEmbed.create(blog)
             return await interaction.response.send_message(embed=embed)
-        except (StopIteration, ValueError):
+        except (KeyError, ValueError):
             # If a specific blog is not selected, send the browser view.
-            txt = search.casefold()
-            yes = [i for i in self.cache if txt in i.text.casefold()]
+            yes = self.index.search(search)
             logger.info("devblog view has %s blogs", len(yes))
             view = DevBlogView(interaction.user, pages=yes)
             return await view.handle_page(interaction)
@@ -466,6 +574,7 @@ class BlogCog(commands.Cog):
         """Remove dev blog trackers from deleted channels"""
         sql = """DELETE FROM dev_blog_channels WHERE channel_id = $1"""
         await self.bot.db.execute(sql, channel.id, timeout=10)
+        self.channels.discard(channel.id)
 
 
 async def setup(bot: PBot) -> None:
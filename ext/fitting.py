@@ -33,7 +33,10 @@ async def get_modules(interaction: Interaction, ship: api.Ship) -> None:
     # Get needed module IDs
     current_ids = interaction.client.modules.keys()
     ship_module_ids = ship.modules.all
-    to_fetch = [i for i in ship_module_ids if i not in current_ids]
+    to_fetch = [i for i in ship_module_ids if str(i) not in current_ids]
+    if not to_fetch:
+        return  # The module catalogue is normally already loaded.
+
     logger.info("Fetching %s", to_fetch)
     interaction.client.modules.update(await api.fetch_modules(to_fetch))
     return
@@ -516,10 +519,6 @@ class Fittings(commands.Cog):
     def __init__(self, bot: PBot) -> None:
         self.bot: PBot = bot
 
-    async def cog_load(self) -> None:
-        """Fetch Generics from API and store to bot."""
-        self.bot.ships = await api.get_ships()
-
     @discord.app_commands.command()
     @discord.app_commands.describe(ship="Search for a ship by it's name")
     async def ship(
@@ -545,13 +544,7 @@ class Fittings(commands.Cog):
         nation: api.Nation | None,
     ) -> None:
         """Get a random ship"""
-        ships = interaction.client.ships
-        if tier:
-            ships = [i for i in ships if i.tier == tier]
-        if class_:
-            ships = [i for i in ships if i.type == class_]
-        if nation:
-            ships = [i for i in ships if i.nation == nation]
+        ships = interaction.client.ships.filter(tier, class_, nation)
 
         if not ships:
             embed = discord.Embed(color=discord.Color.red())
@@ -29,6 +29,7 @@ import ext.flashscore as fs
 from ext.toonbot_utils.fs_transform import fixture_, universal, comp_, team_
 from ext.flashscore.gamestate import GameState
 from ext.utils import embed_utils, flags, image_utils, timed_events
+from ext.utils.playwright_browser import PagePoolFull
 from ext.utils.view_utils import (
     BaseView,
     DropdownPaginator,
@@ -354,16 +355,9 @@ class StandingsView(BaseView):
         table = await obj.get_table(page, cache=interaction.client.cache)
         view = cls(interaction.user, page, obj, parent=parent)
 
-        for i in await page.locator(".subTabs > a").all():
-            text = await i.text_content()
-
-            logger.info("Subtab text content %s", text)
-
-            if not text:
-                continue
-
+        for i in table.tabs if table is not None else []:
             button = copy.copy(view.subtable)
-            button.label = text
+            button.label = i
             view.add_item(button)
 
         if table is not None:
@@ -645,7 +639,7 @@ class TopScorersView(DropdownPaginator):
         embed = await FSEmbed.create(obj)
         players = await obj.get_scorers(page)
 
-        embed.url = page.url
+        embed.url = f"{obj.url}/standings/"
         embed.title = "Top Scorers"
 
         view = TopScorersView(interaction.user, page, embed, players, parent)
@@ -799,7 +793,7 @@ class TransfersView(DropdownPaginator):
         transfers = await self.team.get_transfers(self.page, "All", cache)
         embed = await FSEmbed.create(self.team)
         embed.title = "Transfers (All)"
-        embed.url = self.page.url
+        embed.url = f"{self.team.url}/transfers/"
 
         invoker = interaction.user
         par = self.parent
@@ -1331,6 +1325,23 @@ class FixturesCog(commands.Cog):
         sql = """SELECT * FROM FIXTURES_DEFAULTS"""
         self.fixture_defaults = await self.bot.db.fetch(sql, timeout=10)
 
+    async def cog_app_command_error(
+        self,
+        interaction: Interaction,
+        error: discord.app_commands.AppCommandError,
+    ) -> None:
+        """Tell the user when every browser page is already in use"""
+        if not isinstance(error.__cause__, PagePoolFull):
+            return
+
+        embed = Embed(colour=Colour.red())
+        embed.description = "🚫 Too many lookups running, try again shortly."
+        if interaction.response.is_done():
+            await interaction.edit_original_response(embed=embed, view=None)
+        else:
+            send = interaction.response.send_message
+            await send(embed=embed, ephemeral=True)
+
     # UNIVERAL commands.
     @discord.app_commands.command()
     @discord.app_commands.rename(obj="search")
@@ -1338,7 +1349,7 @@ class FixturesCog(commands.Cog):
     async def table(self, interaction: Interaction, obj: universal) -> None:
         """Fetch a table for a team, competition, or fixture"""
         await interaction.response.defer(thinking=True)
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
 
         obj = get_full_obj(obj)
         view = FSView(interaction.user, page, obj)
@@ -1405,7 +1416,7 @@ class FixturesCog(commands.Cog):
         """Search for upcoming fixtures for a team or competition"""
         assert not isinstance(obj, fs.abc.BaseFixture)
         await interaction.response.defer(thinking=True)
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         await FXPaginator.start(interaction, page, get_full_obj(obj))
 
     @discord.app_commands.command(name="results")
@@ -1415,7 +1426,7 @@ class FixturesCog(commands.Cog):
         """Search for previous results from a team or competition"""
         assert not isinstance(obj, fs.abc.BaseFixture)
         await interaction.response.defer(thinking=True)
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         await RXPaginator.start(interaction, page, get_full_obj(obj))
 
     @discord.app_commands.command()
@@ -1424,7 +1435,7 @@ class FixturesCog(commands.Cog):
     async def news(self, interaction: Interaction, obj: universal) -> None:
         """Get the latest news for a team or fixture"""
         await interaction.response.defer(thinking=True)
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         obj = get_full_obj(obj)
         await FSView(interaction.user, page, obj).news.callback(interaction)
 
@@ -1434,14 +1445,14 @@ class FixturesCog(commands.Cog):
     async def stats(self, interaction: Interaction, match: fixture_) -> None:
         """Look up the stats for a fixture."""
         await interaction.response.defer(thinking=True)
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         await StatsView.start(interaction, page, get_full_obj(match), None)
 
     @discord.app_commands.command(name="lineups")
     @discord.app_commands.describe(match=FIXTURE)
     async def frm(self, interaction: Interaction, match: fixture_) -> None:
         """Look up the lineups and/or formations for a Fixture."""
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         view = FSView(interaction.user, page, get_full_obj(match))
         await view.frm.callback(interaction)
 
@@ -1462,7 +1473,7 @@ class FixturesCog(commands.Cog):
     @discord.app_commands.describe(match=FIXTURE)
     async def smry(self, interaction: Interaction, match: fixture_) -> None:
         """Get a summary for a fixture"""
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         view = FSView(interaction.user, page, get_full_obj(match))
         await view.smr.callback(interaction)
         view.message = await interaction.original_response()
@@ -1471,7 +1482,7 @@ class FixturesCog(commands.Cog):
     @discord.app_commands.describe(match=FIXTURE)
     async def h2h(self, interaction: Interaction, match: fixture_) -> None:
         """Lookup the head-to-head details for a Fixture"""
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         match = get_full_obj(match)
         parent = FSView(interaction.user, page, match)
         await H2HView.start(interaction, page, match, parent)
@@ -1480,7 +1491,7 @@ class FixturesCog(commands.Cog):
     @discord.app_commands.describe(team=TEAM_NAME)
     async def squad(self, interaction: Interaction, team: team_) -> None:
         """Lookup a team's squad members"""
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         team = get_full_obj(team)
         view = FSView(interaction.user, page, team)
         await view.squad.callback(interaction)
@@ -1491,7 +1502,7 @@ class FixturesCog(commands.Cog):
     async def scr(self, interaction: Interaction, obj: comp_) -> None:
         """Get top scorers from a competition."""
         await interaction.response.defer(thinking=True)
-        page = await self.bot.browser.new_page()
+        page = await self.bot.page_pool.acquire()
         obj = get_full_obj(obj)
         await TopScorersView.start(interaction, page, obj)
 
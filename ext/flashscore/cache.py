@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any
+
 from pydantic import parse_obj_as
-from asyncpg import Pool, Record
+from asyncpg import Pool, PostgresError, Record
 from .abc import BaseTeam, BaseCompetition, BaseFixture
 
 logger = logging.getLogger("fsdatabase")
@@ -19,6 +22,11 @@ class FSCache:
     def __init__(self, database: Pool[Record]) -> None:
         self.database = database
 
+        # Rows waiting for the next batched upsert, keyed by ID so repeated
+        # searches for the same entity only write it once.
+        self._pending_comps: dict[str, BaseCompetition] = dict()
+        self._pending_teams: dict[str, BaseTeam] = dict()
+
     async def cache_teams(self) -> None:
         teams = await self.database.fetch("""SELECT * from fs_teams""")
         FSCache.teams = parse_obj_as(list[BaseTeam], teams)
@@ -50,6 +58,50 @@ class FSCache:
         await self.database.executemany(sql, rows, timeout=10)
         await self.cache_teams()
 
+    def queue_competitions(self, comps: list[BaseCompetition]) -> None:
+        """Mark competitions to be saved on the next flush"""
+        for i in comps:
+            if i.id is not None:
+                self._pending_comps[i.id] = i
+
+    def queue_teams(self, teams: list[BaseTeam]) -> None:
+        """Mark teams to be saved on the next flush"""
+        for i in teams:
+            if i.id is not None and i.url:
+                self._pending_teams[i.id] = i
+
+    async def flush_pending(self) -> None:
+        """Save all queued competitions & teams in one upsert each.
+
+        Rows stay queued until they are saved, so a failed write is retried
+        on the next flush."""
+        if self._pending_comps:
+            comps = dict(self._pending_comps)
+            logger.info("Flushing %s queued competitions", len(comps))
+            try:
+                await self.save_competitions(list(comps.values()))
+            except (PostgresError, asyncio.TimeoutError):
+                logger.error("Failed to save competitions", exc_info=True)
+            else:
+                self._unqueue(self._pending_comps, comps)
+
+        if self._pending_teams:
+            teams = dict(self._pending_teams)
+            logger.info("Flushing %s queued teams", len(teams))
+            try:
+                await self.save_teams(list(teams.values()))
+            except (PostgresError, asyncio.TimeoutError):
+                logger.error("Failed to save teams", exc_info=True)
+            else:
+                self._unqueue(self._pending_teams, teams)
+
+    @staticmethod
+    def _unqueue(pending: dict[str, Any], saved: dict[str, Any]) -> None:
+        """Remove saved rows, keeping any that were re-queued meanwhile"""
+        for key, value in saved.items():
+            if pending.get(key) is value:
+                del pending[key]
+
     def get_competition(
         self,
         *,
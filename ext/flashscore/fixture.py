@@ -14,6 +14,7 @@ from .constants import FLASHSCORE
 from .gamestate import GameState
 from .matchevents import IncidentParser, MatchIncident
 from .news import HasNews
+from .pagecache import cached
 from .photos import MatchPhoto
 from .table import HasTable
 from .tv import TVListing
@@ -86,6 +87,7 @@ def set_time(fixture: BaseFixture, node: html.HtmlElement) -> None:
 class HasFixtures:
     url: str | None = None
 
+    @cached("fixtures")
     async def fixtures(
         self, page: Page, cache: FSCache | None = None
     ) -> list[BaseFixture]:
@@ -101,6 +103,7 @@ class HasFixtures:
                 return []
         return await self.parse_games(page, cache)
 
+    @cached("results")
     async def results(
         self, page: Page, cache: FSCache | None = None
     ) -> list[BaseFixture]:
@@ -10,6 +10,7 @@ from playwright.async_api import TimeoutError as PWTimeout
 from pydantic import BaseModel
 
 from .constants import FLASHSCORE
+from .pagecache import cached
 
 if TYPE_CHECKING:
     from playwright.async_api import Page
@@ -23,6 +24,7 @@ class HasNews:
 
     url: str | None
 
+    @cached("news")
     async def get_news(self, page: Page) -> list[NewsArticle]:
         """Fetch a list of NewsArticles for Pagination"""
 
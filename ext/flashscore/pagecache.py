@@ -0,0 +1,138 @@
+"""Shared cache of parsed flashscore sub-pages"""
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, TypeVar
+
+from .abc import BaseFixture
+from .cache import FSCache
+from .gamestate import GameState
+
+logger = logging.getLogger("flashscore.pagecache")
+
+CACHE_SIZE = 256
+LIVE_TTL = 30  # Seconds to keep data for an entity with a game in progress
+IDLE_TTL = 10 * 60  # Seconds to keep data for everything else
+
+IN_PLAY = [
+    GameState.LIVE,
+    GameState.HALF_TIME,
+    GameState.EXTRA_TIME,
+    GameState.STOPPAGE_TIME,
+    GameState.BREAK_TIME,
+    GameState.PENALTIES,
+    GameState.INTERRUPTED,
+]
+
+R = TypeVar("R")
+
+Key = tuple[str, str, str | None]
+
+
+class SubPageCache:
+    """LRU cache of parsed models keyed by (url, sub page, filter button)"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        self.maxsize: int = maxsize
+        self._data: OrderedDict[Key, tuple[float, Any]] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: Key) -> Any | None:
+        """Get an unexpired result, or None"""
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if expires < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Key, value: Any, ttl: float) -> None:
+        """Store a result for ttl seconds"""
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, url: str) -> None:
+        """Drop every cached sub page for a url"""
+        for key in [i for i in self._data if i[0] == url]:
+            del self._data[key]
+
+
+page_cache = SubPageCache()
+
+
+def is_live(obj: Any) -> bool:
+    """Is a fixture, or a team or competition's game, currently in play"""
+    if isinstance(obj, BaseFixture):
+        return obj.state in IN_PLAY
+
+    url = getattr(obj, "url", None)
+    id_ = getattr(obj, "id", None)
+    for i in FSCache.games:
+        if i.state not in IN_PLAY:
+            continue
+
+        if i.competition is not None and i.competition.url == url:
+            return True
+
+        if id_ is not None and id_ in (i.home.team.id, i.away.team.id):
+            return True
+    return False
+
+
+def cached(
+    subpage: str, button: str | None = None
+) -> Callable[
+    [Callable[..., Awaitable[R]]], Callable[..., Awaitable[R]]
+]:
+    """Serve a sub page fetching method from page_cache when possible
+
+    `button` names the argument used to select a filter on the sub page.
+    Empty results are not stored so that failed fetches are retried."""
+
+    def decorator(
+        func: Callable[..., Awaitable[R]]
+    ) -> Callable[..., Awaitable[R]]:
+        sig = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> R:
+            if (url := getattr(self, "url", None)) is None:
+                return await func(self, *args, **kwargs)
+
+            btn = None
+            if button is not None:
+                bound = sig.bind(self, *args, **kwargs)
+                btn = bound.arguments.get(button)
+
+            key = (url, subpage, btn)
+            if (value := page_cache.get(key)) is not None:
+                logger.debug("Cache hit for %s", key)
+                return list(value) if isinstance(value, list) else value
+
+            value = await func(self, *args, **kwargs)
+            if value:
+                ttl = LIVE_TTL if is_live(self) else IDLE_TTL
+                page_cache.set(key, value, ttl)
+                return list(value) if isinstance(value, list) else value
+            return value
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,7 @@
 """Mixin for fetching table from a flashscore item"""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING
 
@@ -12,6 +13,8 @@ from ext.flashscore.cache import FSCache
 
 from .abc import BaseTeam
 from .constants import ADS
+from .pagecache import cached
+from .table_image import fetch_logos, parse_rows, render
 
 if TYPE_CHECKING:
     from playwright.async_api import Page
@@ -24,6 +27,14 @@ class Table(BaseModel):
     image: bytes
 
     teams: list[BaseTeam] = []
+    tabs: list[str] = []  # Labels of the sub table links on the page
+
+
+async def get_tabs(page: Page) -> list[str]:
+    """Get the labels of the sub table links, stored with the table so that
+    cached tables don't need the page"""
+    labels = await page.locator(".subTabs > a").all_text_contents()
+    return [i for i in labels if i]
 
 
 class HasTable:
@@ -31,6 +42,7 @@ class HasTable:
 
     url: str | None
 
+    @cached("standings", button="button")
     async def get_table(
         self,
         page: Page,
@@ -61,6 +73,7 @@ class HasTable:
             return await self.get_draw(page)
 
         tree = html.fromstring(await table_div.inner_html())
+        tabs = await get_tabs(page)
 
         teams: list[BaseTeam] = []
         for i in tree.xpath('.//div[@class="tableCellParticipant__block"]'):
@@ -77,13 +90,19 @@ class HasTable:
             teams.append(team)
 
         if cache:
-            await cache.save_teams(teams)
+            cache.queue_teams(teams)
+
+        # Draw the table ourselves, the screenshot is only for odd layouts.
+        if rows := parse_rows(tree, cache):
+            logos = await fetch_logos(page, rows)
+            img = await asyncio.to_thread(render, rows, logos)
+            return Table(image=img, teams=teams, tabs=tabs)
 
         javascript = "ads => ads.forEach(x => x.remove());"
         await page.eval_on_selector_all(ADS, javascript)
         img = await table_div.screenshot(type="png")
 
-        return Table(image=img, teams=teams)
+        return Table(image=img, teams=teams, tabs=tabs)
 
     async def get_draw(self, page: Page) -> Table | None:
         url = self.base_url + "/draw"
@@ -105,7 +124,7 @@ class HasTable:
         await page.eval_on_selector_all(ADS, javascript)
         img = await draw_div.screenshot(type="png")
 
-        return Table(image=img, teams=[])
+        return Table(image=img, teams=[], tabs=await get_tabs(page))
 
     # Overriden on Fixture
     @property
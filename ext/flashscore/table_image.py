@@ -0,0 +1,233 @@
+"""Draw standings images from parsed table rows with Pillow"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import pathlib
+import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from lxml import html
+from PIL import Image, ImageDraw, ImageFont, UnidentifiedImageError
+from playwright.async_api import Error as PWError
+from pydantic import BaseModel
+
+from .abc import BaseTeam
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+    from .cache import FSCache
+
+logger = logging.getLogger("flashscore.table_image")
+
+LOGO_DIR = pathlib.Path("LogoCache")
+LOGO_SIZE = 28
+LOGO_CACHE_SIZE = 512  # Logos kept in memory, the rest are read from disk
+
+FONT = "Whitney-Medium.ttf"
+ROW_HEIGHT = 40
+WIDTH = 900
+
+BACKGROUND = (30, 31, 34)
+STRIPE = (43, 45, 49)
+HEADER = (88, 101, 242)
+TEXT = (255, 255, 255)
+FADED = (181, 186, 193)
+FORM = {"W": (0, 166, 81), "D": (241, 196, 15), "L": (220, 0, 0)}
+
+# Column Header: x position of the right edge of each stat column
+COLUMNS = {"P": 470, "W": 510, "D": 550, "L": 590, "G": 660, "GD": 710}
+POINTS_X = 760
+FORM_X = 780
+
+# Logo URL: Image bytes, most recently used last
+_logos: OrderedDict[str, bytes] = OrderedDict()
+
+
+def _remember(url: str, logo: bytes) -> bytes:
+    _logos[url] = logo
+    while len(_logos) > LOGO_CACHE_SIZE:
+        _logos.popitem(last=False)
+    return logo
+
+
+class TableRow(BaseModel):
+    """A single row of a league table"""
+
+    team: BaseTeam
+    rank: int
+    points: int
+
+    played: int | None = None
+    win: int | None = None
+    draw: int | None = None
+    loss: int | None = None
+    goals: str | None = None
+    goal_difference: str | None = None
+
+    colour: str | None = None
+    logo_url: str | None = None
+    form: list[str] = []
+
+
+def _int(node: html.HtmlElement, xpath: str) -> int | None:
+    try:
+        return int("".join(node.xpath(xpath)).strip().rstrip("."))
+    except ValueError:
+        return None
+
+
+def parse_rows(
+    tree: html.HtmlElement, cache: FSCache | None = None
+) -> list[TableRow]:
+    """Parse every row of a standings table, or nothing if any are broken"""
+    rows: list[TableRow] = []
+    for i in tree.xpath('.//div[contains(@class, "ui-table__row")]'):
+        xpath = './/a[contains(@class, "tableCellParticipant__name")]'
+        name = "".join(i.xpath(xpath + "/text()")).strip()
+        url = "".join(i.xpath(xpath + "/@href"))
+
+        rank = _int(i, './/div[contains(@class, "tableCellRank")]//text()')
+        pts = _int(i, './/*[contains(@class, "table__cell--points")]//text()')
+        if not name or rank is None or pts is None:
+            return []
+
+        id_ = url.split("/")[-2] if url.count("/") > 1 else None
+        team = cache.get_team(id_) if cache and id_ else None
+        if team is None:
+            team = BaseTeam(name=name, url=url or None, id=id_)
+
+        row = TableRow(team=team, rank=rank, points=pts)
+
+        values = i.xpath('.//*[contains(@class, "table__cell--value")]')
+        stats = [_int(v, ".//text()") for v in values]
+        for attr, value in zip(["played", "win", "draw", "loss"], stats):
+            setattr(row, attr, value)
+
+        xpath = './/*[contains(@class, "table__cell--score")]//text()'
+        row.goals = "".join(i.xpath(xpath)).strip() or None
+        xpath = './/*[contains(@class, "goalsForAgainstDiff")]//text()'
+        row.goal_difference = "".join(i.xpath(xpath)).strip() or None
+
+        xpath = './/div[contains(@class, "tableCellRank")]/@style'
+        style = "".join(i.xpath(xpath))
+        if colour := re.search(r"#[0-9a-fA-F]{6}", style):
+            row.colour = colour.group()
+
+        xpath = './/img[contains(@class, "participant__image")]/@src'
+        row.logo_url = "".join(i.xpath(xpath)) or team.logo_url
+
+        xpath = './/*[contains(@class, "table__cell--form")]//text()'
+        form = [f.strip() for f in i.xpath(xpath)]
+        row.form = [f for f in form if f in FORM][-5:]
+        rows.append(row)
+    return rows
+
+
+async def fetch_logos(page: Page, rows: list[TableRow]) -> dict[str, bytes]:
+    """Load team logos from memory, disk, or the browser, in that order"""
+
+    async def fetch(url: str) -> bytes | None:
+        if (logo := _logos.get(url)) is not None:
+            _logos.move_to_end(url)
+            return logo
+
+        path = LOGO_DIR / url.rsplit("/", maxsplit=1)[-1]
+        if path.exists():
+            return _remember(url, await asyncio.to_thread(path.read_bytes))
+
+        try:
+            resp = await page.request.get(url)
+        except PWError:
+            logger.error("Failed to fetch logo %s", url)
+            return None
+
+        if not resp.ok:
+            return None
+
+        body = _remember(url, await resp.body())
+        LOGO_DIR.mkdir(exist_ok=True)
+        await asyncio.to_thread(path.write_bytes, body)
+        return body
+
+    urls = list(set(i.logo_url for i in rows if i.logo_url))
+    logos = await asyncio.gather(*[fetch(i) for i in urls])
+    return {k: v for k, v in zip(urls, logos) if v is not None}
+
+
+def _font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    try:
+        return ImageFont.truetype(FONT, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def render(rows: list[TableRow], logos: dict[str, bytes]) -> bytes:
+    """Draw a league table as a PNG. This is blocking, use a thread."""
+    height = ROW_HEIGHT * (len(rows) + 1)
+    img = Image.new("RGB", (WIDTH, height), BACKGROUND)
+    drw = ImageDraw.Draw(img)
+    font = _font(18)
+    bold = _font(20)
+
+    def right(x: int, y: int, text: str, fnt=font, fill=TEXT) -> None:
+        drw.text((x, y + ROW_HEIGHT // 2), text, fill, fnt, anchor="rm")
+
+    # Header
+    drw.rectangle((0, 0, WIDTH, ROW_HEIGHT), HEADER)
+    drw.text((70, ROW_HEIGHT // 2), "Team", TEXT, font, anchor="lm")
+    for label, x_pos in COLUMNS.items():
+        right(x_pos, 0, label)
+    right(POINTS_X, 0, "Pts", bold)
+    drw.text((FORM_X, ROW_HEIGHT // 2), "Form", TEXT, font, anchor="lm")
+
+    for num, row in enumerate(rows, 1):
+        top = num * ROW_HEIGHT
+        mid = top + ROW_HEIGHT // 2
+        if num % 2 == 0:
+            drw.rectangle((0, top, WIDTH, top + ROW_HEIGHT), STRIPE)
+
+        if row.colour:
+            drw.rectangle((4, top + 6, 34, top + ROW_HEIGHT - 6), row.colour)
+        drw.text((19, mid), str(row.rank), TEXT, font, anchor="mm")
+
+        if row.logo_url and (raw := logos.get(row.logo_url)):
+            try:
+                with Image.open(io.BytesIO(raw)) as logo:
+                    logo = logo.convert("RGBA")
+                    logo.thumbnail((LOGO_SIZE, LOGO_SIZE))
+                    offset = (ROW_HEIGHT - logo.height) // 2
+                    img.paste(logo, (40, top + offset), logo)
+            except UnidentifiedImageError:
+                pass
+
+        name = row.team.name
+        while font.getlength(name) > 360 and len(name) > 3:
+            name = name[:-2] + "…"
+        drw.text((75, mid), name, TEXT, font, anchor="lm")
+
+        values = [
+            row.played,
+            row.win,
+            row.draw,
+            row.loss,
+            row.goals,
+            row.goal_difference,
+        ]
+        for value, x_pos in zip(values, COLUMNS.values()):
+            if value is not None:
+                right(x_pos, top, str(value), fill=FADED)
+        right(POINTS_X, top, str(row.points), bold)
+
+        for pos, result in enumerate(row.form):
+            x_pos = FORM_X + 8 + pos * 24
+            box = (x_pos, mid - 10, x_pos + 20, mid + 10)
+            drw.rounded_rectangle(box, 4, FORM[result])
+            drw.text((x_pos + 10, mid), result, TEXT, font, "mm")
+
+    img.save(output := io.BytesIO(), "PNG")
+    img.close()
+    return output.getvalue()
@@ -12,6 +12,7 @@ from .fixture import HasFixtures
 from .logos import HasLogo
 from .players import FSPlayer
 from .news import HasNews
+from .pagecache import cached
 from .squad import parse_squad_member
 from .table import HasTable
 from .transfers import FSTransfer
@@ -34,6 +35,7 @@ class Team(BaseTeam, HasFixtures, HasTable, HasNews, HasScorers, HasLogo):
             output = f"{output} ({self.competition.title})"
         return output
 
+    # Not cached, SquadView reads its filter buttons from the loaded page.
     async def get_squad(
         self, page: Page, btn_name: str | None = None
     ) -> list[SquadMember]:
@@ -64,6 +66,7 @@ class Team(BaseTeam, HasFixtures, HasTable, HasNews, HasScorers, HasLogo):
             members += [parse_squad_member(i, position) for i in pl_rows]
         return members
 
+    @cached("transfers", button="label")
     async def get_transfers(
         self, page: Page, label: TFOpts, cache: FSCache
     ) -> list[FSTransfer]:
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 from pydantic import BaseModel
 
 from .constants import FLASHSCORE
+from .pagecache import cached
 from .players import FSPlayer
 
 if TYPE_CHECKING:
@@ -20,6 +21,7 @@ logger = logging.getLogger("flashscore.top_scorers")
 class HasScorers:
     url: str | None
 
+    @cached("top_scorers")
     async def get_scorers(self, page: Page) -> list[TopScorer]:
         """Get a list of TopScorer objects for the Flashscore Item"""
         link = f"{self.url}/standings/"
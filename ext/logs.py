@@ -1,6 +1,8 @@
 """Notify server moderators about specific events"""
 from __future__ import annotations
 
+import asyncio
+import collections
 import datetime
 import logging
 import typing
@@ -15,6 +17,8 @@ from ext.utils import view_utils, timed_events, embed_utils
 
 
 if TYPE_CHECKING:
+    import asyncpg
+
     from core import Bot
     from painezbot import PBot
 
@@ -29,6 +33,68 @@ logger = logging.getLogger("AuditLogs")
 
 Action = discord.AuditLogAction
 
+# Audit log action: The notifications setting that enables it
+SETTINGS: dict[Action, str] = {
+    Action.ban: "bans",
+    Action.unban: "bans",
+    Action.kick: "kicks",
+    Action.member_disconnect: "moderation",
+    Action.member_move: "moderation",
+    Action.member_update: "moderation",
+    Action.automod_flag_message: "moderation",
+    Action.automod_block_message: "moderation",
+    Action.automod_timeout_member: "moderation",
+    Action.message_bulk_delete: "deleted_messages",
+    Action.message_delete: "deleted_messages",
+    Action.app_command_permission_update: "bot_management",
+    Action.bot_add: "bot_management",
+    Action.integration_create: "bot_management",
+    Action.integration_update: "bot_management",
+    Action.integration_delete: "bot_management",
+    Action.webhook_create: "bot_management",
+    Action.webhook_update: "bot_management",
+    Action.webhook_delete: "bot_management",
+    Action.automod_rule_create: "bot_management",
+    Action.automod_rule_update: "bot_management",
+    Action.automod_rule_delete: "bot_management",
+    Action.emoji_create: "emote_and_sticker",
+    Action.emoji_update: "emote_and_sticker",
+    Action.emoji_delete: "emote_and_sticker",
+    Action.sticker_create: "emote_and_sticker",
+    Action.sticker_update: "emote_and_sticker",
+    Action.sticker_delete: "emote_and_sticker",
+    Action.guild_update: "server",
+    Action.channel_create: "channels",
+    Action.channel_update: "channels",
+    Action.channel_delete: "channels",
+    Action.message_pin: "channels",
+    Action.message_unpin: "channels",
+    Action.overwrite_create: "channels",
+    Action.overwrite_update: "channels",
+    Action.overwrite_delete: "channels",
+    Action.stage_instance_create: "channels",
+    Action.stage_instance_update: "channels",
+    Action.stage_instance_delete: "channels",
+    Action.thread_create: "threads",
+    Action.thread_update: "threads",
+    Action.thread_delete: "threads",
+    Action.scheduled_event_create: "events",
+    Action.scheduled_event_update: "events",
+    Action.scheduled_event_delete: "events",
+    Action.invite_create: "invites",
+    Action.invite_update: "invites",
+    Action.invite_delete: "invites",
+    Action.role_create: "role_edits",
+    Action.role_update: "role_edits",
+    Action.role_delete: "role_edits",
+    Action.member_role_update: "user_roles",
+}
+
+
+FLUSH_DELAY = 2.0  # Seconds to wait for more embeds before sending a batch
+BATCH = 10  # Most embeds discord allows in one message
+MAX_BUFFERED = 250  # Embeds held per channel, further entries are dropped
+CLOSE_TIMEOUT = 10.0  # Seconds to keep sending queued embeds on unload
 
 TWTCH = (
     "https://seeklogo.com/images/T/"
@@ -36,12 +102,125 @@ TWTCH = (
 )
 
 
-# TODO: Create LogChannel Object to subsume notifications_cache
+class LogBuffer:
+    """Log entries waiting to be sent to one log channel, packed up to ten
+    embeds to a message so that bursts of events don't hit rate limits.
+
+    An entry's embeds are kept in the same message where possible."""
+
+    def __init__(self, channel: Messageable) -> None:
+        self.channel: Messageable = channel
+        self.entries: collections.deque[list[Embed]] = collections.deque()
+        self.size: int = 0  # Embeds across every queued entry
+        self.task: asyncio.Task[None] | None = None
+        self._full: asyncio.Event = asyncio.Event()
+        # The queued notice of dropped entries, while nothing follows it
+        self._notice: list[Embed] | None = None
+
+        # Statistics
+        self.dropped: int = 0  # Entries counted by the latest notice
+        self.total_dropped: int = 0
+        self.sent: int = 0
+
+    def add(self, embeds: list[Embed]) -> None:
+        """Queue one log entry, dropping it if the buffer is full"""
+        if self.size + len(embeds) > MAX_BUFFERED:
+            self._drop()
+            return
+        self._queue(embeds)
+
+    def _drop(self) -> None:
+        """Count a dropped entry in a notice queued where the drop happened"""
+        self.total_dropped += 1
+        if self.entries and self.entries[-1] is self._notice:
+            self.dropped += 1
+        else:
+            self.dropped = 1
+            self._notice = [Embed(colour=Colour.orange())]
+            self._queue(self._notice)
+        text = f"⚠️ {self.dropped} log entries were dropped"
+        self._notice[0].description = text
+
+    def _queue(self, embeds: list[Embed]) -> None:
+        self.entries.append(embeds)
+        self.size += len(embeds)
+        if self.size >= BATCH:
+            self._full.set()
+
+        if self.task is None:
+            self.task = asyncio.create_task(self.drain())
+
+    async def close(self) -> None:
+        """Send anything queued, discarding what is left after a timeout"""
+        self._full.set()
+        if self.task is None and self.entries:
+            self.task = asyncio.create_task(self.drain())
+
+        if self.task is not None:
+            try:
+                await asyncio.wait_for(self.task, CLOSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+
+        if self.size:
+            logger.error("Discarded %s log embeds", self.size)
+        self.entries.clear()
+        self.size = 0
+
+    def _take(self) -> list[Embed]:
+        """Pop as many whole entries as fit in one message"""
+        batch: list[Embed] = []
+        length: int = 0
+        while self.entries:
+            entry = self.entries[0]
+            size = sum(len(i) for i in entry)
+            if len(batch) + len(entry) > BATCH or length + size >= 6000:
+                break
+            batch += self.entries.popleft()
+            length += size
+
+        if not batch:
+            # An entry too large for one message is sent across several.
+            pages = embed_utils.stack_embeds(self.entries.popleft())
+            pages = [i for i in pages if i]
+            batch = pages[0]
+            self.entries.extendleft(reversed(pages[1:]))
+
+        self.size -= len(batch)
+        return batch
+
+    async def drain(self) -> None:
+        """Wait briefly for more entries, then send until empty"""
+        try:
+            if not self._full.is_set():
+                try:
+                    await asyncio.wait_for(self._full.wait(), FLUSH_DELAY)
+                except asyncio.TimeoutError:
+                    pass
+
+            while self.entries:
+                self._full.clear()
+                batch = self._take()
+                try:
+                    await self.channel.send(embeds=batch)
+                    self.sent += 1
+                except discord.Forbidden:
+                    self.entries.clear()
+                    self.size = 0
+                except discord.HTTPException as err:
+                    logger.error("Failed to send logs: %s", err)
+        finally:
+            self.task = None
+
+
 class LogChannel:
     """A Channel that tracks changes on a discord server."""
 
-    def __init__(self, channel: discord.TextChannel) -> None:
-        self.channel = channel
+    def __init__(self, record: asyncpg.Record) -> None:
+        self.guild_id: int = record["guild_id"]
+        self.channel_id: int = record["channel_id"]
+        # Names of the enabled notifications settings
+        self.settings: set[str] = {k for k, v in record.items() if v is True}
 
 
 # We don't need to db call every single time an event happens, just when
@@ -937,7 +1116,7 @@ class ToggleButton(discord.ui.Button["LogsConfig"]):
 
         cog = interaction.client.get_cog(AuditLogs.__cog_name__)
         assert isinstance(cog, AuditLogs)
-        await cog.update_cache()
+        await cog.update_channel(chan_id)
         return await self.view.update(interaction)
 
 
@@ -972,7 +1151,12 @@ class LogsConfig(view_utils.BaseView):
                 if not (stg := await connection.fetchrow(sql, ch_id)):
                     await connection.execute(sq2, g_id, ch_id)
                     await connection.execute(sq3, ch_id)
-                    return await self.update(interaction, content="Generating")
+
+        if not stg:
+            cog = interaction.client.get_cog(AuditLogs.__cog_name__)
+            assert isinstance(cog, AuditLogs)
+            await cog.update_channel(ch_id)
+            return await self.update(interaction, content="Generating")
 
         embed = Embed(color=0x7289DA, title="Notification Logs config")
         embed.description = "Click buttons below to toggle logging events."
@@ -1015,6 +1199,12 @@ class AuditLogs(commands.Cog):
 
     def __init__(self, bot: Bot | PBot) -> None:
         self.bot = bot
+        # Guild ID: Log Channels
+        self.notifications_cache: dict[int, list[LogChannel]] = dict()
+        # Channel ID: Log Channel
+        self._by_channel: dict[int, LogChannel] = dict()
+        # Channel: Embeds waiting to be sent
+        self.buffers: dict[Messageable, LogBuffer] = dict()
 
     async def update_cache(self) -> None:
         """Get the latest database information and load it into memory"""
@@ -1023,88 +1213,69 @@ class AuditLogs(commands.Cog):
             = notifications_settings.channel_id"""
         async with self.bot.db.acquire(timeout=60) as connection:
             async with connection.transaction():
-                self.notifications_cache = await connection.fetch(sql)
+                records = await connection.fetch(sql)
+
+        self.notifications_cache.clear()
+        self._by_channel.clear()
+        for i in records:
+            self._add(LogChannel(i))
+
+    async def update_channel(self, channel_id: int) -> None:
+        """Reload the settings of a single channel"""
+        sql = """SELECT * FROM notifications_channels LEFT OUTER JOIN
+            notifications_settings ON notifications_channels.channel_id
+            = notifications_settings.channel_id
+            WHERE notifications_channels.channel_id = $1"""
+        record = await self.bot.db.fetchrow(sql, channel_id)
+
+        if (old := self._by_channel.pop(channel_id, None)) is not None:
+            self.notifications_cache[old.guild_id].remove(old)
+        if record is not None:
+            self._add(LogChannel(record))
+
+    def _add(self, log_channel: LogChannel) -> None:
+        guild = self.notifications_cache.setdefault(log_channel.guild_id, [])
+        guild.append(log_channel)
+        self._by_channel[log_channel.channel_id] = log_channel
+
+    def channels(self, guild_id: int, setting: str) -> list[Messageable]:
+        """Get the channels of a guild with a notifications setting enabled"""
+        channels: list[Messageable] = []
+        for i in self.notifications_cache.get(guild_id, []):
+            if setting not in i.settings:
+                continue
+            channel = self.bot.get_channel(i.channel_id)
+            if isinstance(channel, Messageable):
+                channels.append(channel)
+        return channels
 
     async def cog_load(self) -> None:
         """When the cog loads"""
         await self.update_cache()
 
+    async def cog_unload(self) -> None:
+        """Send any buffered logs before unloading"""
+        await asyncio.gather(*[i.close() for i in self.buffers.values()])
+
+    def queue(self, channel: Messageable, embeds: list[Embed]) -> None:
+        """Send embeds to a log channel in the next batch"""
+        if (buffer := self.buffers.get(channel)) is None:
+            buffer = self.buffers[channel] = LogBuffer(channel)
+        buffer.add(embeds)
+
     async def get_channels(
         self, entry: discord.AuditLogEntry
     ) -> list[discord.TextChannel]:
         """Get a list of TextChannels that require a notification for this"""
-
-        cache = self.notifications_cache
-
-        channels = [i for i in cache if i["guild_id"] == entry.guild.id]
-        if not channels:
-            return []
-
         if entry.action == discord.AuditLogAction.message_delete:
             if isinstance(entry.target, (discord.User, discord.Member)):
                 if entry.target.bot:
                     return []
 
-        for setting in {
-            Action.ban: ["bans"],
-            Action.unban: ["bans"],
-            Action.kick: ["kicks"],
-            Action.member_disconnect: ["moderation"],
-            Action.member_move: ["moderation"],
-            Action.member_update: ["moderation"],
-            Action.automod_flag_message: ["moderation"],
-            Action.automod_block_message: ["moderation"],
-            Action.automod_timeout_member: ["moderation"],
-            Action.message_bulk_delete: ["deleted_messages"],
-            Action.message_delete: ["deleted_messages"],
-            Action.app_command_permission_update: ["bot_management"],
-            Action.bot_add: ["bot_management"],
-            Action.integration_create: ["bot_management"],
-            Action.integration_update: ["bot_management"],
-            Action.integration_delete: ["bot_management"],
-            Action.webhook_create: ["bot_management"],
-            Action.webhook_update: ["bot_management"],
-            Action.webhook_delete: ["bot_management"],
-            Action.automod_rule_create: ["bot_management"],
-            Action.automod_rule_update: ["bot_management"],
-            Action.automod_rule_delete: ["bot_management"],
-            Action.emoji_create: ["emote_and_sticker"],
-            Action.emoji_update: ["emote_and_sticker"],
-            Action.emoji_delete: ["emote_and_sticker"],
-            Action.sticker_create: ["emote_and_sticker"],
-            Action.sticker_update: ["emote_and_sticker"],
-            Action.sticker_delete: ["emote_and_sticker"],
-            Action.guild_update: ["server"],
-            Action.channel_create: ["channels"],
-            Action.channel_update: ["channels"],
-            Action.channel_delete: ["channels"],
-            Action.message_pin: ["channels"],
-            Action.message_unpin: ["channels"],
-            Action.overwrite_create: ["channels"],
-            Action.overwrite_update: ["channels"],
-            Action.overwrite_delete: ["channels"],
-            Action.stage_instance_create: ["channels"],
-            Action.stage_instance_update: ["channels"],
-            Action.stage_instance_delete: ["channels"],
-            Action.thread_create: ["threads"],
-            Action.thread_update: ["threads"],
-            Action.thread_delete: ["threads"],
-            Action.scheduled_event_create: ["events"],
-            Action.scheduled_event_update: ["events"],
-            Action.scheduled_event_delete: ["events"],
-            Action.invite_create: ["invites"],
-            Action.invite_update: ["invites"],
-            Action.invite_delete: ["invites"],
-            Action.role_create: ["role_edits"],
-            Action.role_update: ["role_edits"],
-            Action.role_delete: ["role_edits"],
-            Action.member_role_update: ["user_roles"],
-        }[entry.action]:
-            channels = [i for i in channels if i[setting]]
-
-        channels = [self.bot.get_channel(i["channel_id"]) for i in channels]
-        channels = [i for i in channels if isinstance(i, discord.TextChannel)]
-        return channels
+        if (setting := SETTINGS.get(entry.action)) is None:
+            return []
+        channels = self.channels(entry.guild.id, setting)
+        return [i for i in channels if isinstance(i, discord.TextChannel)]
 
     @commands.Cog.listener()
     async def on_audit_log_entry_create(
@@ -1156,13 +1327,7 @@ class AuditLogs(commands.Cog):
         """Event handler to Dispatch new member information
         for servers that request it"""
 
-        cache = self.notifications_cache
-        channels: list[Messageable] = []
-        for i in cache:
-            if i["joins"] and i["guild_id"] == member.guild.id:
-                channel = self.bot.get_channel(i["channel_id"])
-                if isinstance(channel, Messageable):
-                    channels.append(channel)
+        channels = self.channels(member.guild.id, "joins")
 
         if not channels:
             return
@@ -1200,13 +1365,7 @@ class AuditLogs(commands.Cog):
         """Event handler for outputting information about member kick, ban
         or other departures"""
         # Check if in mod action log and override to specific channels.
-        cache = self.notifications_cache
-        channels: list[Messageable] = []
-        for i in cache:
-            if i["joins"] and i["guild_id"] == payload.guild_id:
-                channel = self.bot.get_channel(i["channel_id"])
-                if isinstance(channel, Messageable):
-                    channels.append(channel)
+        channels = self.channels(payload.guild_id, "joins")
 
         if not channels:
             return
@@ -1232,14 +1391,7 @@ class AuditLogs(commands.Cog):
         after: list[Emoji],
     ) -> None:
         """Event listener for outputting information about updated emojis"""
-        cache = self.notifications_cache
-        channels: list[Messageable] = []
-        for i in cache:
-            if i["emote_and_sticker"] and i["guild_id"] == guild.id:
-                i = self.bot.get_channel(i["channel_id"])
-
-                if isinstance(i, Messageable):
-                    channels.append(i)
+        channels = self.channels(guild.id, "emote_and_sticker")
 
         if not channels:
             return
@@ -1294,13 +1446,7 @@ class AuditLogs(commands.Cog):
         if message.author.bot:
             return  # Ignore bots to avoid chain reaction
 
-        cache = self.notifications_cache
-        channels: list[Messageable] = []
-        for i in cache:
-            if i["deleted_messages"] and i["guild_id"] == message.guild.id:
-                channel = message.guild.get_channel(i["channel_id"])
-                if isinstance(channel, Messageable):
-                    channels.append(channel)
+        channels = self.channels(message.guild.id, "deleted_messages")
 
         if not channels:
             return
@@ -1330,6 +1476,10 @@ class AuditLogs(commands.Cog):
 
         embeds = [i for i in [embed, dels] if i]
         for channel in channels:
+            if not atts:
+                self.queue(channel, embeds)
+                continue
+
             try:
                 await channel.send(embeds=embeds, files=atts)
             except discord.HTTPException:
@@ -1342,13 +1492,7 @@ class AuditLogs(commands.Cog):
         if guild is None:
             return
 
-        cache = self.notifications_cache
-        channels: list[Messageable] = []
-        for i in cache:
-            if i["deleted_messages"] and i["guild_id"] == guild.id:
-                channel = self.bot.get_channel(i["channel_id"])
-                if isinstance(channel, Messageable):
-                    channels.append(channel)
+        channels = self.channels(guild.id, "deleted_messages")
 
         if not channels:
             return
@@ -1369,13 +1513,7 @@ class AuditLogs(commands.Cog):
         if before.author.bot:
             return
 
-        cache = self.notifications_cache
-        channels: list[Messageable] = []
-        for i in cache:
-            if i["edited_messages"] and i["guild_id"] == before.guild.id:
-                i = self.bot.get_channel(i["channel_id"])
-                if isinstance(i, Messageable):
-                    channels.append(i)
+        channels = self.channels(before.guild.id, "edited_messages")
 
         if not channels:
             return
@@ -1437,8 +1575,18 @@ class AuditLogs(commands.Cog):
         btn.label = "Jump to message"
         view.add_item(btn)
 
+        # Batched messages can't have a button per entry, and embeds that
+        # share a URL are merged by discord, so link in the description.
+        if (first := embed if embed is not None else gone) is not None:
+            jump = f"[Jump to message]({uri})"
+            first.description = f"{jump}\n{first.description}"
+
         embeds = [i for i in [reply, embed, embe2, gone] if i]
         for i in channels:
+            if not atts:
+                self.queue(i, embeds)
+                continue
+
             try:
                 await i.send(embeds=embeds, view=view, files=atts)
             except (discord.Forbidden, discord.NotFound):
@@ -1449,13 +1597,9 @@ class AuditLogs(commands.Cog):
         """Triggered when a user updates their profile"""
         guilds = [i.id for i in self.bot.guilds if i.get_member(after.id)]
 
-        cache = self.notifications_cache
         channels: list[Messageable] = []
-        for i in cache:
-            if i["users"] and i["guild_id"] in guilds:
-                channel = self.bot.get_channel(i["channel_id"])
-                if isinstance(channel, Messageable):
-                    channels.append(channel)
+        for i in guilds:
+            channels += self.channels(i, "users")
 
         if not channels:
             return
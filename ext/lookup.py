@@ -27,6 +27,17 @@ FAVICON = (
 logger = logging.getLogger("ext.lookup")
 
 
+async def send_connection_error(interaction: Interaction) -> None:
+    """Tell the user transfermarkt could not be reached"""
+    embed = discord.Embed(colour=discord.Colour.red())
+    embed.description = "🚫 Could not reach transfermarkt, try again later."
+    if interaction.response.is_done():
+        await interaction.edit_original_response(embed=embed, view=None)
+    else:
+        send = interaction.response.send_message
+        await send(embed=embed, ephemeral=True)
+
+
 def fmt_player(player: tfm.TFPlayer) -> str:
     flg = flags.get_flags(player.country)
     md = f"[{player.name}]({player.link})"
@@ -404,6 +415,15 @@ class Lookup(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot: Bot = bot
 
+    async def cog_app_command_error(
+        self,
+        interaction: Interaction,
+        error: discord.app_commands.AppCommandError,
+    ) -> None:
+        """Tell the user when transfermarkt could not be reached"""
+        if isinstance(error.__cause__, ConnectionError):
+            await send_connection_error(interaction)
+
     lookup = Group(name="lookup", description="Search on transfermarkt")
 
     @lookup.command(name="player")
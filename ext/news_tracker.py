@@ -3,18 +3,25 @@
 # Migrate the save method to inside the cog.
 from __future__ import annotations  # Cyclic Type hinting
 
+import asyncio
 import datetime
+import functools
+import logging
+import time
 import typing
-import asyncpg
 
+import aiohttp
+import asyncpg
 import discord
 
 from discord.ext import commands, tasks
 
-from lxml import html
+from lxml import etree, html
+from playwright.async_api import Error as PWError
 from playwright.async_api import TimeoutError as pw_TimeoutError
 
 from ext.utils import view_utils
+from ext.utils.playwright_browser import PagePoolFull
 from ext import wows_api as api
 
 if typing.TYPE_CHECKING:
@@ -24,6 +31,22 @@ if typing.TYPE_CHECKING:
     User: typing.TypeAlias = discord.User | discord.Member
 
 RSS_NEWS = "https://worldofwarships.%%/en/rss/news/"
+RSS_PARSER = etree.XMLParser(recover=True, resolve_entities=False)
+ENRICH_PAGES = 2  # Maximum browser pages open to scrape article details
+ENRICH_RETRIES = 3  # Attempts to load an article page before giving up
+
+ARTICLE_SQL = """INSERT INTO news_articles (title, description, partial,
+    link, image, category, date, eu, na, sea) VALUES ($1, $2, $3, $4, $5,
+    $6, $7, $8, $9, $10) ON CONFLICT (partial) DO UPDATE SET
+    (title, description, link, image, category, date, eu, na, sea)
+    = (EXCLUDED.title, EXCLUDED.description, EXCLUDED.link, EXCLUDED.image,
+    EXCLUDED.category, EXCLUDED.date, EXCLUDED.eu, EXCLUDED.na, EXCLUDED.sea)
+    """
+
+logger = logging.getLogger("news_tracker")
+
+# Limits browser pages used for article details, however many are new.
+_enrich_limit = asyncio.Semaphore(ENRICH_PAGES)
 
 
 class Article:
@@ -52,32 +75,40 @@ class Article:
 
         self.date: datetime.datetime | None = None
 
-    # TODO: Move this to a method of bot, move to end of file.
-    async def save(self, bot: PBot) -> None:
-        """Store the article in the database for quicker retrieval in future"""
-
-        sql = """INSERT INTO news_articles (title, description, partial, link,
-                image, category, date, eu, na, sea) VALUES ($1, $2, $3, $4,
-                $5, $6, $7, $8, $9, $10) ON CONFLICT (partial) DO UPDATE SET
-                (title, description, link, image, category, date, eu, na, sea)
-                = (EXCLUDED.title, EXCLUDED.description, EXCLUDED.link,
-                EXCLUDED.image, EXCLUDED.category, EXCLUDED.date, EXCLUDED.eu,
-                EXCLUDED.na, EXCLUDED.sea) """
-        async with bot.db.acquire(timeout=60) as connection:
-            async with connection.transaction():
-                await connection.execute(
-                    sql,
-                    self.title,
-                    self.description,
-                    self.partial,
-                    self.link,
-                    self.image,
-                    self.category,
-                    self.date,
-                    self.eu,
-                    self.na,
-                    self.sea,
-                )
+    @property
+    def row(self) -> tuple[typing.Any, ...]:
+        """Parameters for ARTICLE_SQL"""
+        return (
+            self.title,
+            self.description,
+            self.partial,
+            self.link,
+            self.image,
+            self.category,
+            self.date,
+            self.eu,
+            self.na,
+            self.sea,
+        )
+
+    async def fetch_page(self) -> html.HtmlElement | None:
+        """Load the article in the browser, retrying a limited number of
+        times, with a limited number of pages open at once"""
+        assert self.link is not None
+        async with _enrich_limit:
+            for attempt in range(1, ENRICH_RETRIES + 1):
+                try:
+                    async with self.bot.page_pool.lease() as page:
+                        await page.goto(self.link)
+                        await page.wait_for_selector(".header__background")
+                        return html.fromstring(await page.content())
+                except pw_TimeoutError:
+                    logger.info("Timed out on %s (%s)", self.link, attempt)
+                except (PagePoolFull, PWError) as err:
+                    logger.error("Failed to load %s: %s", self.link, err)
+                    return None
+        logger.error("Gave up fetching article %s", self.link)
+        return None
 
     async def generate_embed(self) -> discord.Embed:
         """Handle dispatching of news article."""
@@ -86,17 +117,11 @@ class Article:
             raise ValueError
 
         if None in [self.title, self.category, self.image, self.description]:
-            page = await self.bot.browser.new_page()
-
-            try:
-                await page.goto(self.link)
-                await page.wait_for_selector(".header__background")
-                tree = html.fromstring(await page.content())
-            except pw_TimeoutError:
-                return await self.generate_embed()
-            finally:
-                await page.close()
+            tree = await self.fetch_page()
+        else:
+            tree = None
 
+        if tree is not None:
             if not self.title:
                 self.title = tree.xpath('.//div[@class="title"]/text()')[0]
 
@@ -167,6 +192,8 @@ class NewsChannel:
         # channel has already sent one.
         # Article, message_id
         self.sent_articles: dict[Article, discord.Message] = dict()
+        # Sends for different regions of one article must not overlap.
+        self.lock: asyncio.Lock = asyncio.Lock()
 
     async def dispatch(
         self, region: api.Region, article: Article
@@ -182,16 +209,18 @@ class NewsChannel:
         if not getattr(self, region.value):
             return
 
-        # Check if this article has already been posted for another region.
-        message = self.sent_articles.get(article)
-        if message is not None:
-            await message.edit(embed=article.embed, view=article.view)
-        else:
-            message = await self.channel.send(
-                embed=article.embed, view=article.view
-            )
+        async with self.lock:
+            # Check if this article has already been posted for another
+            # region.
+            message = self.sent_articles.get(article)
+            if message is not None:
+                await message.edit(embed=article.embed, view=article.view)
+            else:
+                message = await self.channel.send(
+                    embed=article.embed, view=article.view
+                )
 
-        self.sent_articles[article] = message
+            self.sent_articles[article] = message
         return message
 
 
@@ -277,7 +306,7 @@ async def news_ac(
 ) -> list[discord.app_commands.Choice[str]]:
     """An Autocomplete that fetches from recent news articles"""
     choices: list[discord.app_commands.Choice[str]] = []
-    cache = interaction.client.news_cache
+    cache = interaction.client.news_cache.values()
     now = datetime.datetime.now()
 
     cur = cur.casefold()
@@ -292,7 +321,8 @@ async def news_ac(
             continue
 
         name = text[:100]
-        choices.append(discord.app_commands.Choice(name=name, value=i.link))
+        choice = discord.app_commands.Choice(name=name, value=i.partial)
+        choices.append(choice)
 
         if len(choices) == 25:
             break
@@ -305,35 +335,101 @@ class NewsTracker(commands.Cog):
 
     def __init__(self, bot: PBot) -> None:
         self.bot: PBot = bot
+
+        # Conditional GET headers from the last response for each feed
+        self.validators: dict[api.Region, dict[str, str]] = dict()
+        # Size of the last full response, and totals saved by 304s.
+        self.feed_size: dict[api.Region, int] = dict()
+        self.bytes_saved: dict[api.Region, int] = dict()
+        self.latency: dict[api.Region, float] = dict()
+
+        # Partials of articles changed since they were last saved
+        self.dirty: set[str] = set()
+
         self.bot.news = self.news_loop.start()  # pylint: disable=E1101
 
     async def cog_unload(self) -> None:
         """Stop previous runs of tickers upon Cog Reload"""
         self.bot.news.cancel()
+        await self.save_articles()
+
+    async def save_articles(self) -> None:
+        """Store every changed article in one batch"""
+        if not self.dirty:
+            return
+
+        cache = self.bot.news_cache
+        saved = set(self.dirty)
+        rows = [cache[i].row for i in saved if i in cache]
+
+        try:
+            async with self.bot.db.acquire(timeout=60) as connection:
+                async with connection.transaction():
+                    await connection.executemany(ARTICLE_SQL, rows)
+        except (asyncpg.PostgresError, asyncio.TimeoutError):
+            # Left dirty, to be retried on the next tick.
+            err = "Failed to save %s articles"
+            logger.error(err, len(rows), exc_info=True)
+            return
+        self.dirty -= saved
+
+    async def fetch_feed(self, region: api.Region) -> bytes | None:
+        """Get a region's RSS feed, or None if it has not changed"""
+        url = RSS_NEWS.replace("%%", region.domain)
+        headers = self.validators.get(region, {})
+
+        start = time.perf_counter()
+        try:
+            async with self.bot.session.get(url, headers=headers) as resp:
+                if resp.status == 304:
+                    saved = self.feed_size.get(region, 0)
+                    self.bytes_saved[region] = (
+                        self.bytes_saved.get(region, 0) + saved
+                    )
+                    return None
+
+                if resp.status != 200:
+                    logger.error("%s fetching %s", resp.status, url)
+                    return None
+
+                data = await resp.read()
+                validators: dict[str, str] = dict()
+                if etag := resp.headers.get("ETag"):
+                    validators["If-None-Match"] = etag
+                if modified := resp.headers.get("Last-Modified"):
+                    validators["If-Modified-Since"] = modified
+                self.validators[region] = validators
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            logger.error("Failed to fetch %s", url, exc_info=True)
+            return None
+        finally:
+            self.latency[region] = time.perf_counter() - start
+
+        self.feed_size[region] = len(data)
+        return data
 
     @tasks.loop(minutes=1)
     async def news_loop(self) -> None:
         """Loop to get the latest EU news articles"""
+        regions = list(api.Region)
+        feeds = await asyncio.gather(*[self.fetch_feed(i) for i in regions])
 
-        # If we already have parsed the articles once, flag it now.
+        for region, data in zip(regions, feeds):
+            if data is None:
+                continue  # Unchanged since last tick.
 
-        for region in api.Region:
-            url = RSS_NEWS.replace("%%", region.domain)
-
-            async with self.bot.session.get(url) as resp:
-                data = bytes(await resp.text(), encoding="utf8")
-                tree = html.fromstring(data)
+            tree = etree.fromstring(data, RSS_PARSER)
+            if tree is None:
+                continue
 
-            for i in tree.xpath(".//item"):
+            new: list[Article] = []
+            for i in tree.iterfind(".//item"):
                 link = "".join(i.xpath(".//guid/text()"))
                 partial = link.rsplit("/en/", maxsplit=1)[-1]
 
                 cache = self.bot.news_cache
-                try:
-                    article = next(i for i in cache if i.partial == partial)
-                except StopIteration:
-                    article = Article(self.bot, partial)
-                    self.bot.news_cache.append(article)
+                if (article := cache.get(partial)) is None:
+                    article = cache[partial] = Article(self.bot, partial)
 
                 # If we have already dispatched this article for this region
                 if getattr(article, region.value):
@@ -348,7 +444,7 @@ class NewsTracker(commands.Cog):
                     article.link = link  # Original Link
 
                 if article.date is None:
-                    date = "".join(i.xpath(".//pubdate/text()"))
+                    date = "".join(i.xpath(".//pubDate/text()"))
                     if date:
                         fmt = "%a, %d %b %Y %H:%M:%S %Z"
                         article.date = datetime.datetime.strptime(date, fmt)
@@ -374,16 +470,31 @@ class NewsTracker(commands.Cog):
                     if title:
                         article.title = title
 
-                await article.generate_embed()
+                new.append(article)
+                self.dirty.add(article.partial)
+
+            # Page loads are bounded by ENRICH_PAGES.
+            embeds = [i.generate_embed() for i in new]
+            results = await asyncio.gather(*embeds, return_exceptions=True)
 
-                # If we are simply populating, we are not interested.
-                await article.save(self.bot)
+            for article, result in zip(new, results):
+                if isinstance(result, BaseException):
+                    link = article.link
+                    logger.error("Failed to build %s", link, exc_info=result)
+                    # Retry with a full copy of the feed on the next tick.
+                    setattr(article, region.value, False)
+                    self.validators.pop(region, None)
+                    continue
+
+                sends = [
+                    functools.partial(i.dispatch, region, article)
+                    for i in self.bot.news_channels
+                    if getattr(i, region.value)
+                ]
+                name = f"{region.name} news {article.partial}"
+                self.bot.dispatcher.enqueue(name, sends)
 
-                for channel in self.bot.news_channels:
-                    try:
-                        await channel.dispatch(region, article)
-                    except discord.HTTPException:
-                        continue
+        await self.save_articles()
 
     @news_loop.before_loop
     async def update_cache(self) -> None:
@@ -398,11 +509,9 @@ class NewsTracker(commands.Cog):
                 sql = """SELECT * FROM news_articles"""
                 articles = await connection.fetch(sql)
 
-        partials = [i.partial for i in self.bot.news_cache]
-
         record: asyncpg.Record
         for record in articles:
-            if record["partial"] in partials:
+            if record["partial"] in self.bot.news_cache:
                 continue
             article = Article(self.bot, partial=record["partial"])
             for k, value in record.items():
@@ -410,7 +519,7 @@ class NewsTracker(commands.Cog):
                     continue
 
                 setattr(article, k, value)
-            self.bot.news_cache.append(article)
+            self.bot.news_cache[article.partial] = article
 
         # Append new ones.
         cached_ids = [x.channel.id for x in self.bot.news_channels]
@@ -431,14 +540,13 @@ class NewsTracker(commands.Cog):
     @discord.app_commands.autocomplete(text=news_ac)
     async def newspost(self, interaction: Interaction, text: str):
         """Search for a recent World of Warships news article"""
-        try:
-            article = next(i for i in self.bot.news_cache if i.link == text)
-        except StopIteration:
+        if (article := self.bot.news_cache.get(text)) is None:
             embed = discord.Embed(colour=discord.Colour.red())
             embed.description = f"🚫 No article matching {text}"
             return await interaction.response.send_message(embed=embed)
 
         await article.generate_embed()
+        self.dirty.add(article.partial)  # Saved on the next tick.
         send = interaction.response.send_message
         return await send(view=article.view, embed=article.embed)
 
@@ -1,6 +1,8 @@
 """Calculation of Overmatch"""
 from __future__ import annotations
 
+import bisect
+import re
 from typing import TYPE_CHECKING, TypeAlias
 
 import discord
@@ -8,12 +10,16 @@ from discord.ext import commands
 
 if TYPE_CHECKING:
     from painezbot import PBot
+    from ext.wows_api import Ship, ShipRegistry
 
     Interaction: TypeAlias = discord.Interaction[PBot]
 
 
 DC = "https://media.discordapp.net/attachments/"
 OVERMATCH = DC + "303154190362869761/990588535201484800/unknown.png"
+RATIO = 14.3  # Shells overmatch armour thinner than calibre / RATIO
+CALIBRE = re.compile(r"(\d+(?:\.\d+)?) ?mm")
+SHOWN = 10  # Maximum number of ships to list in a field
 
 # TODO: Overmatch DD Dict
 # TODO: Overmatch Ship (guns) command
@@ -110,11 +116,105 @@ OM_CA = {
 }
 
 
+def dense(table: dict[int, list[str]]) -> list[list[str]]:
+    """Expand a threshold table to an entry for every mm up to the last"""
+    out: list[list[str]] = []
+    current: list[str] = []
+    for i in range(max(table) + 1):
+        current = table.get(i, current)
+        out.append(current)
+    return out
+
+
+def lookup(table: list[list[str]], value: int) -> list[str]:
+    """Get the entry for a thickness, clamped to the table's bounds"""
+    if value < 0:
+        return []
+    return table[min(value, len(table) - 1)]
+
+
+# Armour thickness: things of that thickness or less
+CA_TABLE = dense(OM_CA)
+BB_TABLE = dense(OM_BB)
+
+
+def overmatches(calibre: float) -> int:
+    """The thickest armour a shell of this calibre overmatches"""
+    return round(calibre / RATIO)
+
+
+def ship_calibre(ship: Ship) -> float | None:
+    """Get the largest main battery calibre of a ship's stock profile"""
+    art = ship.default_profile.artillery
+    if art is None or not art.slots:
+        return None
+
+    calibres: list[float] = []
+    for gun in art.slots.values():
+        if (match := CALIBRE.search(gun.name)) is not None:
+            calibres.append(float(match.group(1)))
+    return max(calibres, default=None)
+
+
+class ShipTables:
+    """Ships sorted by what they overmatch, and by bow/stern plating."""
+
+    def __init__(self, ships: ShipRegistry) -> None:
+        self.source: ShipRegistry = ships
+
+        guns: list[tuple[int, Ship]] = []
+        plates: list[tuple[int, Ship]] = []
+        for i in ships:
+            if (cal := ship_calibre(i)) is not None:
+                guns.append((overmatches(cal), i))
+            if (armour := i.default_profile.armour) is None:
+                continue
+            if (plate := armour.extremities.min) is not None:
+                plates.append((plate, i))
+
+        guns.sort(key=lambda i: i[0])
+        plates.sort(key=lambda i: i[0])
+
+        self.gun_keys: list[int] = [i[0] for i in guns]
+        self.gun_ships: list[Ship] = [i[1] for i in guns]
+        self.plate_keys: list[int] = [i[0] for i in plates]
+        self.plate_ships: list[Ship] = [i[1] for i in plates]
+
+    def overmatched_by(self, value: int) -> list[Ship]:
+        """Ships whose bow/stern plating a shell overmatching value beats"""
+        return self.plate_ships[: bisect.bisect_right(self.plate_keys, value)]
+
+    def overmatching(self, thickness: int) -> list[Ship]:
+        """Ships whose main guns overmatch armour of this thickness"""
+        return self.gun_ships[bisect.bisect_left(self.gun_keys, thickness) :]
+
+
+def ship_list(ships: list[Ship]) -> str:
+    """A short list of the highest tier ships"""
+    top = sorted(ships, key=lambda i: i.tier, reverse=True)[:SHOWN]
+    rows = [f"{i.emoji} {i.name} (T{i.tier})" for i in top]
+    if len(ships) > SHOWN:
+        rows.append(f"*and {len(ships) - SHOWN} more*")
+    return "\n".join(rows)
+
+
 class OverMatch(commands.Cog):
     """The Overmatch Cog"""
 
     def __init__(self, bot: PBot) -> None:
         self.bot: PBot = bot
+        self._tables: ShipTables | None = None
+
+    @property
+    def tables(self) -> ShipTables:
+        """Ship tables, rebuilt only when the encyclopedia is reloaded"""
+        if self._tables is None or self._tables.source is not self.bot.ships:
+            self._tables = ShipTables(self.bot.ships)
+        return self._tables
+
+    async def cog_load(self) -> None:
+        """Build the ship tables from whatever ships are already loaded"""
+        self._tables = ShipTables(self.bot.ships)
 
     om = discord.app_commands.Group(
         name="overmatch",
@@ -127,22 +227,26 @@ class OverMatch(commands.Cog):
         self, interaction: Interaction, shell_calibre: int
     ) -> None:
         """Get information about what a shell's overmatch parameters"""
-        value = round(shell_calibre / 14.3)
+        value = overmatches(shell_calibre)
 
         embed = discord.Embed(colour=0x0BCDFB)
         embed.title = f"{shell_calibre}mm Shells overmatch {value}mm of Armour"
 
-        ca_om = "\n".join(OM_CA[max(i for i in OM_CA if i <= value)])
+        ca_om = "\n".join(lookup(CA_TABLE, value))
 
         if ca_om:
             embed.add_field(name="Cruisers", value=ca_om, inline=False)
 
-        bb_om = "\n".join(OM_BB[max(i for i in OM_BB if i <= value)])
+        bb_om = "\n".join(lookup(BB_TABLE, value))
         if bb_om:
             embed.add_field(name="Battleships", value=bb_om, inline=False)
 
+        if ships := self.tables.overmatched_by(value):
+            name = f"Bow/Stern overmatched ({len(ships)} ships)"
+            embed.add_field(name=name, value=ship_list(ships), inline=False)
+
         embed.set_thumbnail(url=OVERMATCH)
-        embed.set_footer(text=f"{shell_calibre}mm / 14.3 = {value}mm")
+        embed.set_footer(text=f"{shell_calibre}mm / {RATIO} = {value}mm")
         return await interaction.response.send_message(embed=embed)
 
     @om.command()
@@ -152,21 +256,25 @@ class OverMatch(commands.Cog):
     ) -> None:
         """Get what gun size is required to overmatch an armour thickness"""
         thk = armour_thickness
-        value = round(armour_thickness * 14.3)
+        value = round(armour_thickness * RATIO)
 
         embed = discord.Embed(colour=0x0BCDFB)
         embed.title = f"{thk}mm of Armour is overmatched by {value}mm Guns"
 
-        om_ca = "\n".join(OM_CA[max(i for i in OM_CA if i <= thk)])
+        om_ca = "\n".join(lookup(CA_TABLE, thk))
         if om_ca:
             embed.add_field(name="Cruisers", value=om_ca, inline=False)
 
-        om_bb = "\n".join(OM_BB[max(i for i in OM_BB if i <= thk)])
+        om_bb = "\n".join(lookup(BB_TABLE, thk))
         if om_bb:
             embed.add_field(name="Battleships", value=om_bb, inline=False)
 
+        if ships := self.tables.overmatching(thk):
+            name = f"Overmatched by ({len(ships)} ships)"
+            embed.add_field(name=name, value=ship_list(ships), inline=False)
+
         embed.set_thumbnail(url=OVERMATCH)
-        embed.set_footer(text=f"{value}mm * 14.3 = {value}mm")
+        embed.set_footer(text=f"{thk}mm * {RATIO} = {value}mm")
         return await interaction.response.send_message(embed=embed)
 
 
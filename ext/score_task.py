@@ -130,6 +130,7 @@ class ScoreLoop(commands.Cog):
             i.cancel()
 
         self.bot.cache.games.clear()
+        await self.bot.cache.flush_pending()
 
         while not self.score_workers.empty():
             page = await self.score_workers.get()
@@ -158,6 +159,9 @@ class ScoreLoop(commands.Cog):
                 await page.close()
             logger.info("Finished parsing scores")
 
+        # Teams & Competitions found by searches since the last loop.
+        await self.bot.cache.flush_pending()
+
         self.bot.dispatch("scores_ready", now)
 
     async def handle_pending_fixtures(self, recursion: int = 0) -> None:
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections import OrderedDict
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -38,6 +40,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("flashscore.transformers")
 
+SEARCH_CACHE_SIZE = 256
+SEARCH_TTL = 60 * 60  # Seconds a successful search result is kept
+SEARCH_NEGATIVE_TTL = 5 * 60  # Seconds an empty or failed search is kept
+
 
 # slovak - 7
 # Hebrew - 17
@@ -95,6 +101,57 @@ def get_lang_id(interaction: Interaction) -> int:
             return 1
 
 
+class SearchCache:
+    """LRU Cache of livesport search results with expiry"""
+
+    def __init__(
+        self,
+        maxsize: int = SEARCH_CACHE_SIZE,
+        ttl: float = SEARCH_TTL,
+        negative_ttl: float = SEARCH_NEGATIVE_TTL,
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.negative_ttl: float = negative_ttl
+
+        self._data: OrderedDict[
+            tuple[str, str, int],
+            tuple[float, list[BaseCompetition] | list[BaseTeam]],
+        ] = OrderedDict()
+
+    def get(
+        self, key: tuple[str, str, int]
+    ) -> list[BaseCompetition] | list[BaseTeam] | None:
+        """Get an unexpired result, or None"""
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            return None
+
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(
+        self,
+        key: tuple[str, str, int],
+        value: list[BaseCompetition] | list[BaseTeam],
+    ) -> None:
+        """Store a result, empty results expire sooner"""
+        ttl = self.ttl if value else self.negative_ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+search_cache = SearchCache()
+
+
 @overload
 async def search(
     query: str, mode: Literal["comp"], interaction: Interaction
@@ -120,6 +177,10 @@ async def search(
 
     lang_id = get_lang_id(interaction)
 
+    key = (query.casefold(), mode, lang_id)
+    if (cached := search_cache.get(key)) is not None:
+        return cached
+
     # Type IDs: 1 - Team | Tournament, 2 - Team, 3 - Player 4 - PlayerInTeam
     url = (
         f"https://s.livesport.services/api/v2/search/?q={query}"
@@ -130,6 +191,7 @@ async def search(
         if resp.status != 200:
             rsn = await resp.text()
             logger.error("%s %s: %s", resp.status, rsn, resp.url)
+            return []
         res = await resp.json()
 
     parser = FSParser(res, interaction)
@@ -137,9 +199,13 @@ async def search(
     comps = parser.comps
     teams = parser.teams
     if lang_id == 1:
-        bot = interaction.client
-        bot.loop.create_task(bot.cache.save_competitions(comps), name="cmp_sv")
-        bot.loop.create_task(bot.cache.save_teams(teams), name="team_sv")
+        # Saved in bulk by the score loop.
+        interaction.client.cache.queue_competitions(comps)
+        interaction.client.cache.queue_teams(teams)
+
+    # Cache both sets, a team search often follows a competition search.
+    search_cache.set((key[0], "comp", lang_id), comps)
+    search_cache.set((key[0], "team", lang_id), teams)
     if mode == "comp":
         return comps
     return teams
@@ -297,16 +363,13 @@ async def choose_recent_fixture(
     interaction: Interaction, fsr: BaseCompetition | BaseTeam
 ) -> BaseFixture:
     """Allow the user to choose from the most recent games of a fixture"""
-    page = await interaction.client.browser.new_page()
-
     if isinstance(fsr, BaseCompetition):
         fsr = fs.Competition.parse_obj(fsr)
     else:
         fsr = fs.Team.parse_obj(fsr)
-    try:
+
+    async with interaction.client.page_pool.lease() as page:
         fixtures = await fsr.results(page, interaction.client.cache)
-    finally:
-        await page.close()
 
     view = FSSelect(interaction.user, fixtures)
     await interaction.response.send_message(view=view, embed=view.embeds[0])
@@ -478,12 +541,9 @@ class TFCompetitionTransformer(Transformer):
 
         if "http" in value:
             await interaction.response.defer(thinking=True)
-            page = await interaction.client.browser.new_page()
-            try:
+            async with interaction.client.page_pool.lease() as page:
                 comp = await fs.Competition.by_link(page, value)
                 return BaseCompetition.parse_obj(comp)
-            finally:
-                await page.close()
 
         comps = await search(value, "comp", interaction)
 
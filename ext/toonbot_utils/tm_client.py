@@ -0,0 +1,131 @@
+"""A shared, pooled HTTP client for every request to transfermarkt"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Literal
+
+import aiohttp
+
+from ext.utils.cache import TTLCache
+
+logger = logging.getLogger("transfermarkt.client")
+
+TIMEOUT = 20  # Seconds for a whole request
+LIMIT_PER_HOST = 4  # Requests to transfermarkt in flight at once
+KEEPALIVE = 60  # Seconds to keep an idle connection open
+CACHE_TTL = 10 * 60  # Seconds to keep a page
+CACHE_SIZE = 512  # Pages kept, least recently used are evicted
+
+USER_AGENT = """Mozilla/5.0 (iPad; CPU OS 12_2 like Mac OS X)
+AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148"""
+
+Method = Literal["GET", "POST"]
+
+
+class TMClient:
+    """One aiohttp session, with keep-alive connections and a limit on the
+    number of concurrent requests to the site.
+
+    Pages are cached for a short time, and identical concurrent requests
+    share a single response."""
+
+    def __init__(self, limit_per_host: int = LIMIT_PER_HOST) -> None:
+        self.limit_per_host: int = limit_per_host
+        self.pages: TTLCache[tuple[str, str, str], str]
+        self.pages = TTLCache("transfermarkt", CACHE_TTL, CACHE_SIZE)
+
+        self._session: aiohttp.ClientSession | None = None
+        self._prefetches: set[asyncio.Task[None]] = set()
+
+        # Statistics
+        self.requests: int = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The underlying session, created on first use"""
+        if self._session is None or self._session.closed:
+            cnt = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=KEEPALIVE,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=cnt,
+                headers={"User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and every pooled connection"""
+        for i in self._prefetches:
+            i.cancel()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _fetch(
+        self, method: Method, url: str, params: dict[str, str] | None
+    ) -> str:
+        """Perform a request, raising ConnectionError on failure"""
+        self.requests += 1
+        try:
+            async with self.session.request(method, url, params=params) as r:
+                if r.status != 200:
+                    logger.error("%s %s: %s", method, r.status, r.url)
+                    raise ConnectionError(f"{r.status} on {url}")
+                return await r.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise ConnectionError(f"{err!r} on {url}") from err
+
+    async def get_text(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        *,
+        method: Method = "GET",
+        cache: bool = True,
+    ) -> str:
+        """Request a page and return the body as text.
+
+        If cache is False the site is always asked for a fresh copy."""
+        params = {k: str(v) for k, v in params.items()} if params else None
+        if not cache:
+            return await self._fetch(method, url, params)
+
+        key = (method, url, json.dumps(params, sort_keys=True))
+        return await self.pages.get_or_fetch(
+            key, lambda: self._fetch(method, url, params)
+        )
+
+    def prefetch(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        *,
+        method: Method = "GET",
+    ) -> None:
+        """Fetch a page into the cache in the background"""
+
+        async def fetch() -> None:
+            try:
+                await self.get_text(url, params, method=method)
+            except ConnectionError:
+                pass
+
+        task = asyncio.create_task(fetch())
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+
+
+_client: TMClient | None = None
+
+
+def get_client() -> TMClient:
+    """Get the shared client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = TMClient()
+    return _client
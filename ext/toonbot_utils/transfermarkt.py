@@ -2,37 +2,122 @@
 from __future__ import annotations  # Cyclic Type hinting
 
 from abc import abstractmethod
+import asyncio
+import collections
 import datetime
+import hashlib
 import logging
 from pydantic import BaseModel, validator
-from typing import TypeVar, Literal, Generic
+from typing import Iterable, TypeVar, Literal, Generic
 
-import aiohttp
 from lxml import html
+import yarl
+
+from .tm_client import get_client
 
 TF = "https://www.transfermarkt.co.uk"
 LOOP_URL = f"{TF}/transfers/neuestetransfers/statistik?minMarktwert="
 MIN_MARKET_VALUE = 200000
+SEEN_ROWS = 500  # Rows of the latest transfers page remembered
+ROW_RETRIES = 3  # Polls to retry a row that failed to parse before skipping
 
 logger = logging.getLogger("transfermarkt")
 
-USER_AGENT = """Mozilla/5.0 (iPad; CPU OS 12_2 like Mac OS X)
-AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148"""
-hdr = {"User-Agent": USER_AGENT}
 
+async def fetch_tree(url: str) -> html.HtmlElement:
+    """Get a parsed page from the shared transfermarkt client"""
+    return html.fromstring(await get_client().get_text(url))
+
+
+class LatestTransfers:
+    """The latest transfers page, polled for rows not seen before.
+
+    Pages identical to the last poll are not parsed at all, and rows are
+    only parsed down to the first one that was already seen. Rows that
+    fail to parse are not recorded, and are retried on the next poll."""
+
+    def __init__(self, mmv: int = MIN_MARKET_VALUE) -> None:
+        self.url: str = LOOP_URL + format(mmv, ",").replace(",", ".")
+        self.digest: bytes | None = None
+
+        # Row fingerprint: None, oldest first
+        self.seen: collections.OrderedDict[str, None]
+        self.seen = collections.OrderedDict()
+        # Row fingerprint: Failed attempts
+        self.failed: dict[str, int] = dict()
+
+    @property
+    def primed(self) -> bool:
+        """Whether the rows on the page have been recorded"""
+        return bool(self.seen)
+
+    @staticmethod
+    def fingerprint(row: html.HtmlElement) -> str:
+        """Identify a row by its player, clubs, and fee"""
+        return "|".join(row.xpath(".//a/@href"))
+
+    async def poll(self) -> list[Transfer] | None:
+        """Get new transfers, newest first, or None if the page is unchanged
+
+        The first poll only records the rows on the page."""
+        try:
+            src = await get_client().get_text(self.url, cache=False)
+        except ConnectionError:
+            logger.error("Failed to fetch recent transfers")
+            return None
 
-async def recent_transfers(mmv: int = MIN_MARKET_VALUE) -> list[Transfer]:
-    """Get the most recent transfers"""
-    url = LOOP_URL + format(mmv, ",").replace(",", ".")
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=hdr) as resp:
-            if resp.status != 200:
-                logger.error("recent_transfers %s: %s", resp.status, resp.url)
-                return []
-            tree = html.fromstring(await resp.text())
+        digest = hashlib.blake2b(src.encode(), digest_size=16).digest()
+        if digest == self.digest:
+            return None
 
         xpath = './/div[@class="responsive-table"]/div/table/tbody/tr'
-        return [await Transfer.from_loop(i) for i in tree.xpath(xpath)]
+        rows: list[html.HtmlElement] = []
+        keys: list[str] = []
+        for row in html.fromstring(src).xpath(xpath):
+            if (key := self.fingerprint(row)) in self.seen:
+                if self.failed:
+                    continue  # Rows to retry may be further down.
+                break  # Everything below has already been output.
+            rows.append(row)
+            keys.append(key)
+
+        if not self.primed:
+            self._record(reversed(keys))
+            self.digest = digest
+            return []
+
+        if rows:
+            logger.info("Parsing %s new transfer rows", len(rows))
+        parsed = [Transfer.from_loop(i) for i in rows]
+        results = await asyncio.gather(*parsed, return_exceptions=True)
+
+        transfers: list[Transfer] = []
+        failed: dict[str, int] = dict()
+        done: list[str] = []
+        for key, result in reversed(list(zip(keys, results))):
+            if isinstance(result, Transfer):
+                transfers.append(result)
+                done.append(key)
+                continue
+
+            logger.error("Failed to parse transfer %s: %r", key, result)
+            if (attempts := self.failed.get(key, 0) + 1) < ROW_RETRIES:
+                failed[key] = attempts
+            else:
+                done.append(key)  # Give up, don't output it.
+
+        self._record(done)
+        self.failed = failed
+        # Parse the page again next time, even if it has not changed.
+        self.digest = None if failed else digest
+        return transfers[::-1]
+
+    def _record(self, keys: Iterable[str]) -> None:
+        """Mark rows as output, oldest first"""
+        for key in keys:
+            self.seen[key] = None
+        while len(self.seen) > SEEN_ROWS:
+            self.seen.popitem(last=False)
 
 
 class SearchResult(BaseModel):
@@ -66,12 +151,7 @@ class TFCompetition(SearchResult):
     async def get_attendance(self) -> list[StadiumAttendance]:  # list[StadAtt]
         """Fetch attendances for the competition"""
         url = self.link.replace("startseite", "besucherzahlen")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=hdr) as resp:
-                if resp.status != 200:
-                    logger.error("attendance %s: %s", resp.status, resp.url)
-                tree = html.fromstring(await resp.text())
+        tree = await fetch_tree(url)
 
         xp = './/table[@class="items"]/tbody/tr[@class="odd" or @class="even"]'
         return [StadiumAttendance(i) for i in tree.xpath(xp)]
@@ -92,11 +172,7 @@ class TFTeam(SearchResult):
     async def get_contracts(self) -> list[Contract]:
         """Helper method for fetching contracts"""
         url = self.link.replace("startseite", "vertragsende")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=hdr) as resp:
-                if resp.status != 200:
-                    logger.error("get_contracts %s: %s", resp.status, resp.url)
-                tree = html.fromstring(await resp.text())
+        tree = await fetch_tree(url)
 
         rows: list[Contract] = []
 
@@ -134,11 +210,7 @@ class TFTeam(SearchResult):
         return rows
 
     async def get_league(self) -> TFCompetition:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.link, headers=hdr) as resp:
-                if resp.status != 200:
-                    logger.error("get_leaguye %s: %s", resp.status, resp.url)
-                tree = html.fromstring(await resp.text())
+        tree = await fetch_tree(self.link)
 
         name = tree.xpath('.//span[@class="data-header__club"]/a/text()')
         name = "".join(name).strip()
@@ -150,11 +222,7 @@ class TFTeam(SearchResult):
     async def get_rumours(self) -> list[Rumour]:
         """Helper method for fetching rumours"""
         url = self.link.replace("startseite", "geruechte")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=hdr) as resp:
-                if resp.status != 200:
-                    logger.error("get_rumours %s: %s", resp.status, resp.url)
-                tree = html.fromstring(await resp.text())
+        tree = await fetch_tree(url)
 
         rows: list[Rumour] = []
         xpath = './/div[@class="large-8 columns"]/div[@class="box"]'
@@ -196,12 +264,7 @@ class TFTeam(SearchResult):
             List of Outbound Transfers
         """
         url = self.link.replace("startseite", "transfers")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=hdr) as resp:
-                if resp.status != 200:
-                    logger.error("get_transfers %s: %s", resp.status, url)
-                tree = html.fromstring(await resp.text())
+        tree = await fetch_tree(url)
 
         xpath = (
             './/div[@class="box"][.//h2[contains(text(),"Arrivals")]]'
@@ -222,11 +285,7 @@ class TFTeam(SearchResult):
         """Get A list of Trophy Objects related to the team"""
 
         url = self.link.replace("startseite", "erfolge")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=hdr) as resp:
-                if resp.status != 200:
-                    logger.error("get_trophies %s: %s", resp.status, resp.url)
-                tree = html.fromstring(await resp.text())
+        tree = await fetch_tree(url)
 
         trophies: list[Trophy] = []
         for i in tree.xpath('.//div[@class="box"][./div[@class="header"]]'):
@@ -398,8 +457,8 @@ class Transfer(BaseModel):
     async def from_loop(cls, node: html.HtmlElement) -> Transfer:
         """Generated from the Transfer Ticker Loop"""
         player = cls.get_player(node)
-        old = await cls.team(node, "4")
-        new = await cls.team(node, "5")
+        teams = cls.team(node, "4"), cls.team(node, "5")
+        old, new = await asyncio.gather(*teams)
         fee = cls.get_fee(node)
         player.team = new
 
@@ -425,6 +484,9 @@ class Transfer(BaseModel):
 
 ResultT = TypeVar("ResultT", bound=SearchResult)
 
+SEARCH_URL = TF + "/schnellsuche/ergebnis/schnellsuche"
+RESULTS_PER_PAGE = 10
+
 
 class TransfermarktSearch(Generic[ResultT]):
     """An object representing a connection to the transfermarket website"""
@@ -442,25 +504,27 @@ class TransfermarktSearch(Generic[ResultT]):
 
     def __init__(self, query: str) -> None:
         self.query = query
+        self.current_url = SEARCH_URL
+        self.expected_results = 0
 
     @staticmethod
     @abstractmethod
     def parse(rows: list[html.HtmlElement]) -> list[ResultT]:
         raise NotImplementedError
 
-    async def get_page(self, page: int = 1) -> list[ResultT]:
-        """Generate a SearchView from the query"""
-        url = TF + "/schnellsuche/ergebnis/schnellsuche"
+    def params(self, page: int) -> dict[str, str | int]:
+        """Query parameters for a page of results"""
         # Header names, scrape then compare (don't follow a pattern.)
         # TransferMarkt Search indexes from 1.
-        params = {"query": self.query, self.query_string: page}
+        return {"query": self.query, self.query_string: page}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, params=params, headers=hdr) as resp:
-                if resp.status != 200:
-                    logger.error("Search get %s: %s", resp.status, resp.url)
-                self.current_url = str(resp.url)
-                tree = html.fromstring(await resp.text())
+    async def get_page(self, page: int = 1) -> list[ResultT]:
+        """Generate a SearchView from the query"""
+        client = get_client()
+        params = self.params(page)
+        src = await client.get_text(SEARCH_URL, params, method="POST")
+        tree = html.fromstring(src)
+        self.current_url = str(yarl.URL(SEARCH_URL).with_query(params))
 
         # Get trs of table after matching header / {ms} name.
         xpath = (
@@ -479,6 +543,10 @@ class TransfermarktSearch(Generic[ResultT]):
             count = 0
         self.expected_results = count
         self.results = self.parse(tree.xpath(trs))
+
+        # Users page through in order, so fetch the next page meanwhile.
+        if page * RESULTS_PER_PAGE < count:
+            client.prefetch(SEARCH_URL, self.params(page + 1), method="POST")
         return self.results
 
 
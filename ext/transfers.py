@@ -4,9 +4,12 @@ from __future__ import annotations
 
 # Cyclic Type hintingd
 
+import asyncio
+import collections
+import datetime
 import logging
 from importlib import reload
-from typing import TYPE_CHECKING, TypeAlias
+from typing import TYPE_CHECKING, Iterable, TypeAlias
 
 import discord
 from discord import Embed
@@ -22,6 +25,8 @@ logger = logging.getLogger("transfers.py")
 if TYPE_CHECKING:
     from asyncio import Task
 
+    import asyncpg
+
     from core import Bot
 
     Interaction: TypeAlias = discord.Interaction[Bot]
@@ -31,6 +36,16 @@ if TYPE_CHECKING:
 NOPERMS = "```yaml\nI need the following permissions.\n"
 NO_EMBED_PERMS = "A transfer was found, but toonbot needs embed_links perms."
 TFM_COLOUR = 0x1A3151
+PARSED_SIZE = 2000  # Transfers remembered, so they are not output twice
+SENDS = 5  # Channels sent to at once
+DEBUG_CHANNEL = 1108036536710209546
+
+# (Month, Day) each transfer window opens and closes
+WINDOWS = [((1, 1), (2, 1)), ((6, 14), (9, 1))]
+DEADLINE_POLL = 20  # Seconds between polls on deadline day
+WINDOW_POLL = 60  # Seconds between polls while a window is open
+CLOSED_POLL = 300  # Seconds between polls out of season
+ACTIVE_FOR = datetime.timedelta(minutes=30)  # Poll faster after a transfer
 
 DEFAULT_LEAGUES = [
     tfm.TFCompetition(
@@ -122,6 +137,54 @@ class TransferEmbed(Embed):
         return markdown
 
 
+def poll_interval(now: datetime.datetime, active: bool) -> int:
+    """Poll faster the more transfers are likely to be announced"""
+    today = (now.month, now.day)
+    for opens, closes in WINDOWS:
+        if today == closes:
+            return DEADLINE_POLL
+        if opens <= today < closes:
+            return WINDOW_POLL
+    return WINDOW_POLL if active else CLOSED_POLL
+
+
+class Routes:
+    """The channels tracking each league, kept in memory until a ticker's
+    config changes"""
+
+    def __init__(self) -> None:
+        # League link: Channel IDs
+        self.by_link: dict[str, set[int]] = dict()
+        self.stale: bool = True
+
+    def invalidate(self) -> None:
+        """Reload from the database before the next lookup"""
+        self.stale = True
+
+    async def load(self, db: asyncpg.Pool) -> None:
+        """Fetch every tracked league of every ticker"""
+        sql = """SELECT transfers_channels.channel_id, link
+                 FROM transfers_channels JOIN transfers_leagues
+                 ON transfers_channels.channel_id
+                 = transfers_leagues.channel_id"""
+        by_link: dict[str, set[int]] = dict()
+        for i in await db.fetch(sql):
+            by_link.setdefault(i["link"], set()).add(i["channel_id"])
+        self.by_link = by_link
+        self.stale = False
+
+    def channels(self, links: Iterable[str | None]) -> set[int]:
+        """Get the IDs of the channels tracking any of these leagues"""
+        out: set[int] = set()
+        for i in links:
+            if i is not None:
+                out |= self.by_link.get(i, set())
+        return out
+
+
+routes = Routes()
+
+
 class TFCompetitionTransformer(Transformer):
     """Get a Competition from user Input"""
 
@@ -216,6 +279,7 @@ class Config(view_utils.DropdownPaginator):
         rows = [(self.channel.id, x) for x in sel.values]
 
         await itr.client.db.executemany(sql, rows)
+        routes.invalidate()
 
         for i in sel.values:
             league = next(j for j in self.leagues if j.link == i)
@@ -263,6 +327,7 @@ class Config(view_utils.DropdownPaginator):
             async with connection.transaction():
                 await connection.execute(sql, id_)
                 await connection.executemany(sq2, fields)
+        routes.invalidate()
 
         self.leagues = DEFAULT_LEAGUES
 
@@ -306,6 +371,7 @@ class Config(view_utils.DropdownPaginator):
         await view_itr.response.edit_message(embed=embed, view=None)
         sql = """DELETE FROM transfers_channels WHERE channel_id = $1"""
         await interaction.client.db.execute(sql, self.channel.id)
+        routes.invalidate()
 
 
 class Transfers(commands.Cog):
@@ -313,21 +379,34 @@ class Transfers(commands.Cog):
 
     def __init__(self, bot: Bot) -> None:
         self.bot: Bot = bot
-        self.parsed: list[str] = []
+        # Player link: None, oldest first
+        self.parsed: collections.OrderedDict[str, None]
+        self.parsed = collections.OrderedDict()
         self.task: Task[None]
         reload(lookup)
         reload(tfm)
 
-        self._override_once: bool = False
+        self.feed: tfm.LatestTransfers = tfm.LatestTransfers()
+        self.last_active: datetime.datetime | None = None
 
     async def cog_load(self) -> None:
         """Load the transfer channels on cog load."""
+        routes.invalidate()
         self.task = self.transfers_loop.start()  # pylint: disable=E1101
 
     async def cog_unload(self) -> None:
         """Cancel transfers task on Cog Unload."""
         self.task.cancel()
 
+    async def cog_app_command_error(
+        self,
+        interaction: Interaction,
+        error: discord.app_commands.AppCommandError,
+    ) -> None:
+        """Tell the user when transfermarkt could not be reached"""
+        if isinstance(error.__cause__, ConnectionError):
+            await lookup.send_connection_error(interaction)
+
     async def get_config(
         self, interaction: Interaction, channel: discord.TextChannel | None
     ) -> Config | None:
@@ -389,6 +468,7 @@ class Transfers(commands.Cog):
                     (channel.id, x.name, x.country[0], x.link) for x in lgs
                 ]
                 await connection.executemany(sq2, rows)
+        routes.invalidate()
         return Config(interaction.user, channel, lgs)
 
     # Core Loop
@@ -397,61 +477,75 @@ class Transfers(commands.Cog):
         """
         Core transfer ticker loop
 
-        Refresh every minute and get all new transfers from transfermarkt
+        Get all new transfers from transfermarkt, more often during
+        transfer windows and most often on deadline day.
         """
-        skip_output = not bool(self.parsed)
-
-        if self._override_once:
-            skip_output = False
-            self._override_once = False
-
-        bad: list[int] = []
-        for i in await tfm.recent_transfers():
+        now = discord.utils.utcnow()
+        # We don't need to output when populating after a restart.
+        transfers = await self.feed.poll()
+        if transfers:
+            self.last_active = now
+
+        active = bool(self.last_active and now - self.last_active < ACTIVE_FOR)
+        interval = poll_interval(now, active)
+        self.transfers_loop.change_interval(seconds=interval)
+
+        new: list[tfm.Transfer] = []
+        for i in transfers or []:
             if i.player.link in self.parsed:
                 continue  # skip when duplicate / void.
 
-            self.parsed.append(i.player.link)
+            self.parsed[i.player.link] = None
+            new.append(i)
 
-            # We don't need to output when populating after a restart.
-            if skip_output:
-                continue
+        while len(self.parsed) > PARSED_SIZE:
+            self.parsed.popitem(last=False)
 
-            old = i.old_team.league.link if i.old_team.league else None
-            new = i.new_team.league.link if i.new_team.league else None
+        if not new:
+            return
 
-            if old is new is None:
-                continue
+        if routes.stale:
+            await routes.load(self.bot.db)
 
-            # Fetch the list of channels to output the transfer to.
-            sql = """SELECT DISTINCT transfers_channels.channel_id
-                     FROM transfers_channels LEFT OUTER JOIN transfers_leagues
-                     ON transfers_channels.channel_id
-                     = transfers_leagues.channel_id WHERE link in ($1, $2)"""
-            records = await self.bot.db.fetch(sql, old, new)
+        # Channel ID: Embeds, in the order they were found.
+        outbox: dict[int, list[Embed]] = dict()
+        for i in new:
+            old_lg, new_lg = i.old_team.league, i.new_team.league
+            links = [old_lg.link if old_lg else None]
+            links.append(new_lg.link if new_lg else None)
+            if links == [None, None]:
+                continue
 
             embed = TransferEmbed(i)
+            for channel_id in routes.channels(links) | {DEBUG_CHANNEL}:
+                outbox.setdefault(channel_id, []).append(embed)
 
-            for record in records:
-                channel = self.bot.get_channel(record["channel_id"])
+        bad: list[int] = []
+        limit = asyncio.Semaphore(SENDS)
 
-                if not isinstance(channel, discord.TextChannel):
-                    continue
+        async def send(channel_id: int, embeds: list[Embed]) -> None:
+            channel = self.bot.get_channel(channel_id)
+            if not isinstance(channel, discord.TextChannel):
+                return
 
-                if channel.is_news():
-                    bad.append(channel.id)
-                    continue
+            if channel.is_news():
+                bad.append(channel.id)
+                return
 
-                try:
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
+            async with limit:
+                for embed in embeds:
                     try:
-                        await channel.send(NO_EMBED_PERMS)
+                        await channel.send(embed=embed)
                     except discord.Forbidden:
-                        bad.append(channel.id)
+                        try:
+                            await channel.send(NO_EMBED_PERMS)
+                        except discord.Forbidden:
+                            bad.append(channel.id)
+                        return
+                    except discord.HTTPException:
+                        logger.error("Transfer to %s failed", channel.id)
 
-            DEBUG_CHANNEL = self.bot.get_channel(1108036536710209546)
-            if isinstance(DEBUG_CHANNEL, discord.TextChannel):
-                await DEBUG_CHANNEL.send(embed=embed)
+        await asyncio.gather(*[send(k, v) for k, v in outbox.items()])
 
         if bad:
             logger.info("Found %s bad transfer channels", bad)
@@ -517,6 +611,7 @@ class Transfers(commands.Cog):
             tfr.link,
             timeout=60,
         )
+        routes.invalidate()
 
         embed = discord.Embed(title="Transfers: Tracked League Added")
         embed.description = f"{cfg.channel.mention}: {fmt_league(tfr)}"
@@ -529,6 +624,7 @@ class Transfers(commands.Cog):
         sql = """DELETE FROM transfers_channels WHERE channel_id = $1"""
         if await self.bot.db.execute(sql, chan.id) != "DELETE 0":
             logger.info("%s TF Channel auto-deleted", chan.id)
+            routes.invalidate()
 
 
 async def setup(bot: Bot):
@@ -0,0 +1,84 @@
+"""Typed, size bounded TTL caches for responses from web APIs"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+logger = logging.getLogger("cache")
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """An LRU cache whose entries expire after `ttl` seconds.
+
+    Concurrent misses for the same key share a single fetch."""
+
+    def __init__(self, name: str, ttl: float, maxsize: int) -> None:
+        self.name: str = name
+        self.ttl: float = ttl
+        self.maxsize: int = maxsize
+
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Task[V]] = dict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<TTLCache {self.name} size={len(self._data)}/{self.maxsize} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
+
+    def get(self, key: K) -> V | None:
+        """Get an unexpired value, or None"""
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            return None
+
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used if full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Forget a stored value"""
+        self._data.pop(key, None)
+
+    async def get_or_fetch(
+        self, key: K, fetch: Callable[[], Awaitable[V]]
+    ) -> V:
+        """Return the stored value, or fetch and store it"""
+        if (value := self.get(key)) is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        if (task := self._inflight.get(key)) is None:
+
+            async def run() -> V:
+                try:
+                    value = await fetch()
+                    self.set(key, value)
+                    return value
+                finally:
+                    self._inflight.pop(key, None)
+
+            task = self._inflight[key] = asyncio.create_task(run())
+        return await asyncio.shield(task)
@@ -0,0 +1,98 @@
+"""Background fan-out of messages to many subscribed channels"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import time
+from typing import Any, Awaitable, Callable, TypeAlias
+
+import discord
+
+logger = logging.getLogger("dispatcher")
+
+WORKERS = 4  # Sends in flight at once, discord.py handles 429 retries
+HISTORY = 50  # Completed fan-outs remembered for reporting
+
+Send: TypeAlias = Callable[[], Awaitable[Any]]
+
+
+class Fanout:
+    """One item being sent to a number of channels"""
+
+    def __init__(self, name: str, total: int) -> None:
+        self.name: str = name
+        self.total: int = total
+        self.remaining: int = total
+        self.failed: int = 0
+        self.started: float = time.perf_counter()
+        self.duration: float | None = None
+
+    def __repr__(self) -> str:
+        done = self.total - self.remaining
+        return f"<Fanout {self.name} {done}/{self.total}>"
+
+
+class Dispatcher:
+    """Polling loops enqueue sends here and carry on polling. Workers send
+    them with bounded concurrency in the background."""
+
+    def __init__(self, workers: int = WORKERS) -> None:
+        self.workers: int = workers
+        self.queue: asyncio.Queue[tuple[Fanout, Send]] = asyncio.Queue()
+        self.completed: collections.deque[Fanout]
+        self.completed = collections.deque(maxlen=HISTORY)
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        """Start the worker tasks"""
+        if self._tasks:
+            return
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def close(self) -> None:
+        """Stop the workers, abandoning anything still queued"""
+        for i in self._tasks:
+            i.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def enqueue(self, name: str, sends: list[Send]) -> Fanout:
+        """Queue a send to each subscriber, returning a Fanout to track it"""
+        fanout = Fanout(name, len(sends))
+        for i in sends:
+            self.queue.put_nowait((fanout, i))
+
+        if not sends:
+            self._finish(fanout)
+        return fanout
+
+    def _finish(self, fanout: Fanout) -> None:
+        fanout.duration = time.perf_counter() - fanout.started
+        self.completed.append(fanout)
+        logger.info(
+            "Sent %s to %s channels (%s failed) in %.2fs",
+            fanout.name,
+            fanout.total,
+            fanout.failed,
+            fanout.duration,
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            fanout, send = await self.queue.get()
+            try:
+                await send()
+            except discord.HTTPException:
+                fanout.failed += 1
+                logger.error("Failed to send %s", fanout.name, exc_info=True)
+            except Exception:  # pylint: disable=W0718
+                # Never let one bad send kill the worker.
+                fanout.failed += 1
+                logger.exception("Error sending %s", fanout.name)
+            finally:
+                self.queue.task_done()
+                fanout.remaining -= 1
+                if not fanout.remaining:
+                    self._finish(fanout)
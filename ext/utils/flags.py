@@ -97,6 +97,32 @@ def to_indicators(inp: str) -> str:
     return "".join(out)
 
 
+# Casefolded name: flag, built on first use by _build_flags.
+_flags: dict[str, str] = dict()
+# Strings we have already failed to find, so we only log them once.
+_missing: set[str] = set()
+
+
+def _build_flags() -> None:
+    """Precompute every known spelling of every country"""
+    for ctry in countries:  # type: ignore
+        flag = to_indicators(ctry.alpha_2)  # type: ignore
+        for attr in ["alpha_2", "alpha_3", "name", "official_name"]:
+            if (value := getattr(ctry, attr, None)) is not None:
+                _flags.setdefault(value.casefold(), flag)
+
+        if (value := getattr(ctry, "common_name", None)) is not None:
+            # Common names take precedence, e.g. "Bolivia"
+            _flags[value.casefold()] = flag
+
+    for key, value in backup_dict.items():
+        _flags.setdefault(key, value)
+
+    # Manual Overrides take precedence over everything.
+    for key, value in country_dict.items():
+        _flags[key.casefold()] = to_indicators(value)
+
+
 def get_flags(strings: list[str]) -> list[str]:
     """Get Multiple Flags"""
     return [get_flag(i) for i in strings]
@@ -104,32 +130,20 @@ def get_flags(strings: list[str]) -> list[str]:
 
 def get_flag(string: str | None) -> str:
     """Get a flag emoji from a string representing a country"""
-    # Try pycountry
     if string is None:
         return ""
 
-    try:
-        return to_indicators(country_dict[string])
-    except KeyError:
-        pass
+    if not _flags:
+        _build_flags()
 
     string = string.casefold()
-
-    retrieved = countries.get(name=string)  # type: ignore
-    if retrieved is not None:
-        return to_indicators(retrieved.alpha_2)  # type: ignore
-
     try:
-        retrieved = countries.lookup(string)  # type: ignore
-        return to_indicators(str(retrieved.alpha_2))  # type: ignore
-    except (AttributeError, LookupError):
+        return _flags[string]
+    except KeyError:
         pass
 
-    # Use manual fallbacks
-    try:
-        retrieved = backup_dict[string]
-        return retrieved
-    except KeyError:
+    if string not in _missing:
+        _missing.add(string)
         logger.error("No country found for '%s'", string)
 
     # Other.
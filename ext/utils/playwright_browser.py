@@ -1,6 +1,223 @@
 """Use Playwright to control a header-less Browser"""
 from __future__ import annotations
-from playwright.async_api import async_playwright, BrowserContext, ViewportSize
+
+import asyncio
+import contextlib
+import logging
+import time
+import weakref
+from typing import AsyncIterator, Literal
+
+from playwright.async_api import (
+    async_playwright,
+    BrowserContext,
+    Error as PWError,
+    Page,
+    ViewportSize,
+)
+
+logger = logging.getLogger("playwright_browser")
+
+POOL_SIZE = 8  # Maximum pages open for interactive views at once
+LEASE_TIMEOUT = 30  # Seconds to queue for a page before giving up
+SLOW_LEASE = 5  # Log a warning if a lease waits longer than this
+MAX_LEASE = 30 * 60  # Seconds before a lease is assumed abandoned
+
+# Every page handed out by a pool, so views can return them without a bot.
+_owners: weakref.WeakKeyDictionary[Page, PagePool]
+_owners = weakref.WeakKeyDictionary()
+
+
+class PagePoolFull(Exception):
+    """Raised when no page could be leased from a PagePool"""
+
+
+class PagePool:
+    """A bounded pool of browser pages leased out to interactive views
+
+    Overflow decides what happens when every page is leased: "queue" waits
+    up to `lease_timeout` seconds for one to be released, "reject" raises
+    PagePoolFull immediately."""
+
+    def __init__(
+        self,
+        browser: BrowserContext,
+        maxsize: int = POOL_SIZE,
+        *,
+        overflow: Literal["queue", "reject"] = "queue",
+        lease_timeout: float = LEASE_TIMEOUT,
+    ) -> None:
+        self.browser: BrowserContext = browser
+        self.maxsize: int = maxsize
+        self.overflow: Literal["queue", "reject"] = overflow
+        self.lease_timeout: float = lease_timeout
+
+        self._idle: list[Page] = []
+        self._leased: dict[Page, float] = dict()  # Page: Lease Start
+        self._holders: dict[Page, int] = dict()  # Page: Views holding it
+        self._pending: int = 0  # Slots taken by pages being opened or reset
+        self._released: asyncio.Condition = asyncio.Condition()
+
+        # Statistics
+        self.leases: int = 0
+        self.rejected: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Average number of seconds spent waiting for a lease"""
+        return self.total_wait / self.leases if self.leases else 0.0
+
+    def _full(self) -> bool:
+        return len(self._leased) + self._pending >= self.maxsize
+
+    async def acquire(self) -> Page:
+        """Lease a page, opening a new one if the pool is not full"""
+        start = time.perf_counter()
+
+        abandoned: list[Page] = []
+        async with self._released:
+            if self._full():
+                abandoned = self._reclaim_abandoned()
+
+            if self._full():
+                if self.overflow == "reject":
+                    self.rejected += 1
+                    raise PagePoolFull(f"All {self.maxsize} pages leased")
+
+                free = lambda: not self._full()  # noqa: E731
+                try:
+                    wait = self._released.wait_for(free)
+                    await asyncio.wait_for(wait, self.lease_timeout)
+                except asyncio.TimeoutError:
+                    self.rejected += 1
+                    raise PagePoolFull(f"No page after {self.lease_timeout}s")
+
+            page = None
+            while self._idle:
+                if not (page := self._idle.pop()).is_closed():
+                    break
+                page = None
+
+            if page is None:
+                self._pending += 1
+            else:
+                self._lease(page)
+
+        # Browser round trips happen outside the lock.
+        for i in abandoned:
+            if not i.is_closed():
+                await i.close()
+
+        if page is None:
+            try:
+                page = await self.browser.new_page()
+            finally:
+                async with self._released:
+                    self._pending -= 1
+                    if page is not None:
+                        self._lease(page)
+                    else:
+                        self._released.notify()
+
+        waited = time.perf_counter() - start
+        self.leases += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > SLOW_LEASE:
+            logger.warning("Waited %.2fs for a page lease", waited)
+        return page
+
+    def _lease(self, page: Page) -> None:
+        self._leased[page] = time.monotonic()
+        self._holders[page] = 0
+        _owners[page] = self
+
+    def retain(self, page: Page) -> None:
+        """Record another view using a leased page. Each retain must be
+        matched by a release before the page returns to the pool."""
+        if page in self._leased:
+            self._holders[page] += 1
+
+    async def release(self, page: Page) -> None:
+        """Return a page to the pool once nothing holds it. Releasing a page
+        that is not leased does nothing."""
+        async with self._released:
+            if page not in self._leased:
+                return
+
+            if (holders := self._holders[page] - 1) > 0:
+                self._holders[page] = holders
+                return
+
+            del self._leased[page]
+            del self._holders[page]
+            _owners.pop(page, None)
+            self._pending += 1  # Keep the slot until the page is reset.
+
+        reusable = False
+        if not page.is_closed():
+            try:
+                await page.goto("about:blank")
+                reusable = True
+            except PWError:
+                await page.close()
+
+        async with self._released:
+            self._pending -= 1
+            if reusable:
+                self._idle.append(page)
+            self._released.notify()
+
+    def _reclaim_abandoned(self) -> list[Page]:
+        """Forget pages whose views never released them, returning them to
+        be closed"""
+        cutoff = time.monotonic() - MAX_LEASE
+        abandoned: list[Page] = []
+        for page, started in list(self._leased.items()):
+            if started > cutoff:
+                continue
+
+            logger.warning("Reclaiming page leased for over %ss", MAX_LEASE)
+            del self._leased[page]
+            del self._holders[page]
+            _owners.pop(page, None)
+            abandoned.append(page)
+        return abandoned
+
+    @contextlib.asynccontextmanager
+    async def lease(self) -> AsyncIterator[Page]:
+        """Lease a page for the duration of a with block"""
+        page = await self.acquire()
+        try:
+            yield page
+        finally:
+            await self.release(page)
+
+    async def close(self) -> None:
+        """Close every page the pool has opened"""
+        for page in self._idle + list(self._leased):
+            if not page.is_closed():
+                await page.close()
+        self._idle.clear()
+        self._leased.clear()
+        self._holders.clear()
+
+
+def retain_page(page: Page) -> None:
+    """Record another holder of a page leased from a pool"""
+    if (pool := _owners.get(page)) is not None:
+        pool.retain(page)
+
+
+async def release_page(page: Page) -> None:
+    """Give a page back to the pool it came from, or close it if unpooled"""
+    if (pool := _owners.get(page)) is not None:
+        return await pool.release(page)
+
+    if not page.is_closed():
+        await page.close()
 
 
 async def make_browser() -> BrowserContext:
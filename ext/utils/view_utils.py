@@ -10,6 +10,7 @@ from discord import Embed, Message, SelectOption
 from discord.ui import TextInput, Select
 
 from ext.utils import embed_utils
+from ext.utils.playwright_browser import release_page, retain_page
 
 if TYPE_CHECKING:
     from core import Bot
@@ -28,6 +29,7 @@ class BaseView(discord.ui.View):
 
     message: Message | None = None
     embed: Embed | None = None
+    _held: Page | None = None
 
     def __init__(
         self,
@@ -45,6 +47,19 @@ class BaseView(discord.ui.View):
         if parent is None:
             self.remove_item(self.parent_button)
 
+    @property
+    def page(self) -> Page:
+        """The browser page this view drives, often shared with its parent"""
+        return self._page
+
+    @page.setter
+    def page(self, page: Page) -> None:
+        # Each view holds its own reference, so the page only goes back to
+        # the pool once every view using it has timed out. Views that are
+        # never sent are released by the child view shown in their place.
+        retain_page(page)
+        self._page = self._held = page
+
     @discord.ui.button(label="Back", emoji="🔼")
     async def parent_button(self, interaction: Interaction, _) -> None:
         """Send Parent View"""
@@ -80,10 +95,7 @@ class BaseView(discord.ui.View):
         for i in self.children:
             i.disabled = True  # type: ignore
 
-        page: Page | None
-        if (page := getattr(self, "page", None)) is not None:
-            if not page.is_closed():
-                await page.close()
+        await self.release_pages()
 
         if self.message is not None:
             try:
@@ -93,6 +105,22 @@ class BaseView(discord.ui.View):
         else:
             logger.error("Message not set on view %s", self.__class__.__name__)
 
+    async def release_pages(self) -> None:
+        """Release the page held by this view, and by any parents that were
+        never sent, as those never time out to release it themselves"""
+        views: list[BaseView] = [self]
+        parent = self.parent
+        while parent is not None:
+            if parent.is_dispatching() or parent.is_finished():
+                break  # It releases its own page when it times out.
+            views.append(parent)
+            parent = parent.parent
+
+        for view in views:
+            if (page := view._held) is not None:
+                view._held = None
+                await release_page(page)
+
     async def on_error(  # type: ignore
         self,
         interaction: Interaction,
@@ -17,6 +17,7 @@ from .clan import (
     get_clan_vortex_data,
     get_member_vortex,
 )
+from .client import WGClient, get_client
 from .devblog import DevBlog, get_dev_blogs
 from .emojis import (
     # Game Modes
@@ -56,7 +57,7 @@ from .emojis import (
     SUBMARINE_SPECIAL_EMOJI,
     SHIP_EMOTES,
 )
-from .enums import Nation, Region
+from .enums import League, Nation, Region
 from .gamemode import GameMode, get_game_modes
 from .maps import get_maps, Map
 from .modules import Module, fetch_modules
@@ -68,6 +69,7 @@ from .player import (
     ModeArmamentStats,
     fetch_player_stats,
     fetch_player_ship_stats,
+    fetch_stats_by_id,
 )
 from .transformers import (
     clan_transform,
@@ -77,7 +79,7 @@ from .transformers import (
     region_transform,
     ship_transform,
 )
-from .warships import Ship, ShipFit, ShipProfile, get_ships
+from .warships import Ship, ShipFit, ShipProfile, ShipRegistry, get_ships
 
 __all__ = [
     # clan
@@ -97,6 +99,9 @@ __all__ = [
     "ClanVortexData",
     "ClanMember",
     "ClanMemberVortexData",
+    # client
+    "WGClient",
+    "get_client",
     # devblog
     "DevBlog",
     "get_dev_blogs",
@@ -138,6 +143,7 @@ __all__ = [
     "Map",
     "get_maps",
     # enums
+    "League",
     "Nation",
     "Region",
     # gamemode,
@@ -154,11 +160,13 @@ __all__ = [
     "PlayerShipStats",
     "fetch_player_ship_stats",
     "fetch_player_stats",
+    "fetch_stats_by_id",
     # ship
     "get_ships",
     "Ship",
     "ShipProfile",
     "ShipFit",
+    "ShipRegistry",
     # transformers
     "clan_transform",
     "class_transform",
@@ -5,8 +5,9 @@ import datetime
 import logging
 from typing import Any
 
-import aiohttp
 from pydantic import BaseModel
+from ext.utils.cache import TTLCache
+from .client import get_client
 from .enums import Region
 from .wg_id import WG_ID
 
@@ -25,52 +26,71 @@ WINNERS = "https://clans.worldofwarships.eu/api/ladder/winners/"
 
 __all__ = []
 
+# Clan ID: Response
+clan_cache: TTLCache[int, Clan] = TTLCache("clans", 30 * 60, 256)
+clan_vortex_cache: TTLCache[int, ClanVortexData]
+clan_vortex_cache = TTLCache("clan_vortex", 10 * 60, 256)
+member_vortex_cache: TTLCache[int, list[ClanMemberVortexData]]
+member_vortex_cache = TTLCache("member_vortex", 10 * 60, 128)
+
 
 async def get_clan_details(clan_id: int, region: Region) -> Clan:
     """Feetch a Clan's Details"""
-    params = {"application_id": WG_ID, "clan_id": clan_id, "extra": "members"}
 
-    url = CLAN_DETAILS.replace("%%", region.domain)
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params) as resp:
-            data = await resp.json()
-    return Clan.parse_obj(data.pop("data")[str(clan_id)])
+    async def fetch() -> Clan:
+        params = {
+            "application_id": WG_ID,
+            "clan_id": clan_id,
+            "extra": "members",
+        }
+        url = CLAN_DETAILS.replace("%%", region.domain)
+        data = await get_client().get_json(url, params)
+        return Clan.parse_obj(data.pop("data")[str(clan_id)])
+
+    return await clan_cache.get_or_fetch(clan_id, fetch)
 
 
 async def get_clan_vortex_data(clan_id: int, region: Region) -> ClanVortexData:
     """Get clan data from the vortex api"""
-    url = VORTEX_INFO.replace("%%", region.domain)
-    url = url.replace("CLAN_ID", str(clan_id))
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
-            data = await resp.json()
+    async def fetch() -> ClanVortexData:
+        url = VORTEX_INFO.replace("%%", region.domain)
+        url = url.replace("CLAN_ID", str(clan_id))
+
+        data = await get_client().get_json(url)
+        return ClanVortexData(**data.pop("clanview"))
 
-    return ClanVortexData(**data.pop("clanview"))
+    return await clan_vortex_cache.get_or_fetch(clan_id, fetch)
 
 
 async def get_member_vortex(
     clan: int, region: Region
 ) -> list[ClanMemberVortexData]:
     """Attempt to fetch clan battle stats for members"""
-    url = f"https://clans.worldofwarships.{region.domain}/api/members/{clan}/"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
-            data = await resp.json()
 
-    return [ClanMemberVortexData(**i) for i in data.pop("items")]
+    async def fetch() -> list[ClanMemberVortexData]:
+        dom = region.domain
+        url = f"https://clans.worldofwarships.{dom}/api/members/{clan}/"
+        data = await get_client().get_json(url)
+        return [ClanMemberVortexData(**i) for i in data.pop("items")]
+
+    # Copy, so callers can sort without affecting the cache.
+    return list(await member_vortex_cache.get_or_fetch(clan, fetch))
 
 
 async def get_cb_leaderboard(
     season: int | None = None, region: Region | None = None
 ) -> list[ClanLeaderboardStats]:
     """Get the leaderboard for a clan battle season"""
+    realm = region.realm if region is not None else "global"
+    data = await fetch_cb_leaderboard_data(season, realm)
+    return [ClanLeaderboardStats(**i) for i in data]
+
+
+async def fetch_cb_leaderboard_data(
+    season: int | None, realm: str
+) -> list[dict[str, Any]]:
+    """Get the raw ladder for a season & realm, None for the current season"""
     params: dict[str, Any] = dict()
 
     # league: int, 0 = Hurricane.
@@ -79,30 +99,27 @@ async def get_cb_leaderboard(
     if season is not None:
         params.update({"season": str(season)})
 
-    params.update({"realm": region.realm if region is not None else "global"})
-    async with aiohttp.ClientSession() as session:
-        async with session.get(LEADERBOARD, params=params) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
-            return [ClanLeaderboardStats(**i) for i in await resp.json()]
+    params.update({"realm": realm})
+    return await get_client().get_json(LEADERBOARD, params)
 
 
 async def get_cb_seasons(language: str = "en") -> list[ClanBattleSeason]:
     """Retrieve a list of ClanBattleSeason objects from the API"""
+    return parse_cb_seasons(await fetch_cb_season_data(language))
+
+
+async def fetch_cb_season_data(language: str = "en") -> dict[str, Any]:
+    """Get the raw clan battle season data from the API"""
     params = {"application_id": WG_ID, language: language}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(CB_SEASON_INFO, params=params) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
+    data = await get_client().get_json(CB_SEASON_INFO, params)
+    count = data.pop("meta")["count"]
+    logger.info("Fetched %s Clan Battle Seasons", count)
+    return data.pop("data")
 
-            data = await resp.json()
-            count = data.pop("meta")["count"]
-            logger.info("Fetched %s Clan Battle Seasons", count)
-            data = data.pop("data")
 
+def parse_cb_seasons(data: dict[str, Any]) -> list[ClanBattleSeason]:
+    """Build ClanBattleSeasons from raw API data"""
     output: list[ClanBattleSeason] = []
     for k, val in data.items():  # Key is useless
         if len(str(k)) == 3:
@@ -113,13 +130,7 @@ async def get_cb_seasons(language: str = "en") -> list[ClanBattleSeason]:
 
 async def get_cb_winners() -> dict[int, list[ClanBattleWinner]]:
     """Get Winners for all Clan Battle Seasons"""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(WINNERS) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
-            data = await resp.json()
-
+    data = await get_client().get_json(WINNERS)
     winners = data.pop("winners")
 
     # k is season - int
@@ -587,10 +598,5 @@ class PartialClan(BaseModel):
         url += "?battle_type=cvc"
         params = {"battle_type": "cvc", "season": season}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as resp:
-                if resp.status != 200:
-                    err = f"{resp.status} {await resp.text()} on {url}"
-                    raise ConnectionError(err)
-                season_stats = await resp.json()
+        season_stats = await get_client().get_json(url, params)
         return [PlayerCBStats(**i) for i in season_stats["items"]]
@@ -0,0 +1,220 @@
+"""A shared, pooled HTTP client for every request to the Wargaming APIs"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger("api.client")
+
+TIMEOUT = 15  # Seconds for a whole request
+CONNECT_TIMEOUT = 5  # Seconds to establish a connection
+RETRIES = 3
+BACKOFF = 0.5  # Seconds, doubled after each failed attempt
+LIMIT_PER_HOST = 10
+KEEPALIVE = 60  # Seconds to keep an idle connection open
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Wargaming allow 10 requests per second per application id.
+RATE = 10  # Tokens added per second
+BURST = 10  # Maximum tokens held
+
+InflightKey = tuple[str, str, int, float | None]
+
+
+class TokenBucket:
+    """Allow `rate` requests per second, with bursts of up to `capacity`"""
+
+    def __init__(self, rate: float = RATE, capacity: int = BURST) -> None:
+        self.rate: float = rate
+        self.capacity: int = capacity
+
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._tokens = min(
+                    self.capacity, self._tokens + elapsed * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class WGClient:
+    """One aiohttp session, with keep-alive connections pooled per regional
+    host, timeouts, and retry with exponential backoff.
+
+    Requests are throttled by a token bucket per application id (or per host
+    for the APIs that do not take one), and identical concurrent requests
+    share a single response."""
+
+    def __init__(
+        self,
+        *,
+        timeout: float = TIMEOUT,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        limit_per_host: int = LIMIT_PER_HOST,
+    ) -> None:
+        self.timeout = aiohttp.ClientTimeout(
+            total=timeout, sock_connect=connect_timeout
+        )
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.limit_per_host: int = limit_per_host
+
+        self._session: aiohttp.ClientSession | None = None
+        self._buckets: dict[str, TokenBucket] = dict()
+        self._inflight: dict[InflightKey, asyncio.Task[bytes]] = dict()
+
+        # Statistics
+        self.requests: int = 0
+        self.coalesced: int = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The underlying session, created on first use"""
+        if self._session is None or self._session.closed:
+            cnt = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=KEEPALIVE,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=cnt, timeout=self.timeout
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and every pooled connection"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _bucket(self, url: str, params: dict[str, Any] | None) -> TokenBucket:
+        """Get the rate limiter for this request's application id or host"""
+        if params is not None and "application_id" in params:
+            key = str(params["application_id"])
+        else:
+            key = urlsplit(url).netloc
+
+        try:
+            return self._buckets[key]
+        except KeyError:
+            bucket = self._buckets[key] = TokenBucket()
+            return bucket
+
+    async def _fetch(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        retries: int,
+        timeout: aiohttp.ClientTimeout,
+    ) -> bytes:
+        """Perform a GET, retrying connection errors and server errors"""
+        bucket = self._bucket(url, params)
+        attempt = 0
+        while True:
+            last = attempt >= retries
+            await bucket.acquire()
+            self.requests += 1
+            try:
+                get = self.session.get(url, params=params, timeout=timeout)
+                async with get as resp:
+                    if resp.status in RETRY_STATUSES and not last:
+                        logger.warning("%s on %s, retrying", resp.status, url)
+                    elif resp.status != 200:
+                        text = await resp.text()
+                        logger.error("%s %s: %s", resp.status, text, resp.url)
+                        raise ConnectionError(f"{resp.status} on {url}")
+                    else:
+                        return await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if last:
+                    raise ConnectionError(f"{err!r} on {url}") from err
+                logger.warning("%r on %s, retrying", err, url)
+
+            await asyncio.sleep(self.backoff * 2**attempt)
+            attempt += 1
+
+    async def get_bytes(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        *,
+        retries: int | None = None,
+        timeout: float | None = None,
+    ) -> bytes:
+        """GET a url and return the raw body.
+
+        retries and timeout override the client's defaults for this request,
+        e.g. for autocompletes that must answer within a few seconds.
+
+        If an identical request with the same retries and timeout is already
+        running, wait for its response instead of sending another. Cancelling
+        one caller does not cancel the request for the others."""
+        params = {k: str(v) for k, v in params.items()} if params else None
+        if retries is None:
+            retries = self.retries
+        tmt = self.timeout
+        if timeout is not None:
+            tmt = aiohttp.ClientTimeout(total=timeout)
+        key = (url, json.dumps(params, sort_keys=True), retries, tmt.total)
+
+        if (task := self._inflight.get(key)) is not None:
+            self.coalesced += 1
+        else:
+            fetch = self._fetch(url, params, retries, tmt)
+            task = asyncio.create_task(fetch)
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def get_json(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        *,
+        retries: int | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """GET a url and decode the JSON body"""
+        body = await self.get_bytes(
+            url, params, retries=retries, timeout=timeout
+        )
+        return json.loads(body)
+
+    async def get_text(
+        self, url: str, params: dict[str, Any] | None = None
+    ) -> str:
+        """GET a url and return the body as text"""
+        return (await self.get_bytes(url, params)).decode("utf-8")
+
+
+_client: WGClient | None = None
+
+
+def get_client() -> WGClient:
+    """Get the shared client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = WGClient()
+    return _client
@@ -1,19 +1,23 @@
 """Fetching and parsing of World of Warships Dev Blogs."""
 import logging
+from collections import OrderedDict
+
 from lxml import html
 
-import aiohttp
+from .client import get_client
 
 logger = logging.getLogger("api.devblog")
 
 RSS_FEED = "https://blog.worldofwarships.com/rss-en.xml"
+PAGE_CACHE_SIZE = 64  # Parsed article bodies kept in memory
+
+# Blog ID: (Title, Text, Parsed article__content), most recently used last
+_pages: OrderedDict[int, tuple[str, str, html.HtmlElement]] = OrderedDict()
 
 
 async def get_dev_blogs() -> list[int]:
     """Get all recent dev blogs."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(RSS_FEED) as resp:
-            tree = html.fromstring(bytes(await resp.text(), encoding="utf8"))
+    tree = html.fromstring(await get_client().get_bytes(RSS_FEED))
 
     blog_ids: list[int] = []
     for i in tree.xpath(".//item"):
@@ -45,10 +49,20 @@ class DevBlog:
         return f"https://blog.worldofwarships.com/blog/{self.id}"
 
     async def fetch_text(self) -> html.HtmlElement:
-        """Get the HTML content for a devblog"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.url) as resp:
-                tree = html.fromstring(await resp.text())
+        """Get the HTML content for a devblog, fetching and parsing the page
+        only if it is not already cached. Sets the title and text."""
+        if (page := _pages.get(self.id)) is not None:
+            _pages.move_to_end(self.id)
+            self.title, self.text, content = page
+            return content
+
+        tree = html.fromstring(await get_client().get_text(self.url))
 
         self.title = tree.xpath('.//h2[@class="article__title"]/text()')[0]
-        return tree.xpath('.//div[@class="article__content"]')[0]
+        content = tree.xpath('.//div[@class="article__content"]')[0]
+        self.text = content.text_content()
+
+        _pages[self.id] = (self.title, self.text, content)
+        while len(_pages) > PAGE_CACHE_SIZE:
+            _pages.popitem(last=False)
+        return content
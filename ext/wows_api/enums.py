@@ -40,6 +40,16 @@ class Nation(enum.Enum):
     USA = ("American", "usa", "🇺🇸")
 
 
+class League(enum.Enum):
+    """Clan Battle Leagues, as numbered by the ladder API"""
+
+    HURRICANE = 0
+    TYPHOON = 1
+    STORM = 2
+    GALE = 3
+    SQUALL = 4
+
+
 class Region(enum.Enum):
     """A Generic object representing a region"""
 
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
-import aiohttp
 from pydantic import BaseModel
 
+from .client import get_client
 from .wg_id import WG_ID
 
 logger = logging.getLogger("api.gamemodes")
@@ -15,16 +16,20 @@ MODES = "https://api.worldofwarships.eu/wows/encyclopedia/battletypes/"
 
 async def get_game_modes() -> list[GameMode]:
     """Get a list of Game Modes from the API"""
+    return parse_game_modes(await fetch_game_mode_data())
+
+
+async def fetch_game_mode_data() -> dict[str, Any]:
+    """Get the raw game mode data from the API"""
     params = {"application_id": WG_ID, "language": "en"}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(MODES, params=params) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
-            data = await resp.json()
+    data = await get_client().get_json(MODES, params)
+    return data.pop("data")
+
 
-    return [GameMode.parse_obj(i) for i in data.pop("data").values()]
+def parse_game_modes(data: dict[str, Any]) -> list[GameMode]:
+    """Build GameModes from raw API data"""
+    return [GameMode.parse_obj(i) for i in data.values()]
 
 
 class GameMode(BaseModel):
@@ -0,0 +1,144 @@
+"""Clan Battle leaderboards, served from memory"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import gzip
+import json
+import logging
+import pathlib
+from typing import Any
+
+from ext.utils.cache import TTLCache
+from .clan import ClanBattleSeason, ClanLeaderboardStats
+from .clan import fetch_cb_leaderboard_data
+from .enums import League, Region
+
+logger = logging.getLogger("api.leaderboard")
+
+LADDERS = pathlib.Path("snapshots/leaderboards")
+LADDER_TTL = 30 * 60  # Current season ladders are refreshed more often
+REALMS = [i.realm for i in Region] + ["global"]
+
+
+class Ladder:
+    """One season's leaderboard for one realm, with lookup indexes"""
+
+    def __init__(
+        self, season: int | None, realm: str, raw: list[dict[str, Any]]
+    ) -> None:
+        self.season: int | None = season
+        self.realm: str = realm
+        self.raw: list[dict[str, Any]] = raw
+
+        clans = [ClanLeaderboardStats(**i) for i in raw]
+        self.clans: list[ClanLeaderboardStats] = sorted(
+            clans, key=lambda i: (i.league, i.division, i.rank)
+        )
+
+        self.by_id: dict[int, ClanLeaderboardStats] = dict()
+        self.by_tag: dict[str, list[ClanLeaderboardStats]] = dict()
+        self.by_league: dict[int, list[ClanLeaderboardStats]] = dict()
+        for i in self.clans:
+            self.by_id[i.id] = i
+            self.by_tag.setdefault(i.tag.casefold(), []).append(i)
+            self.by_league.setdefault(i.league, []).append(i)
+
+    def __repr__(self) -> str:
+        return f"<Ladder {self.season} {self.realm} ({len(self.clans)})>"
+
+    def find(self, tag: str) -> list[ClanLeaderboardStats]:
+        """Get clans with an exact tag"""
+        return self.by_tag.get(tag.casefold(), [])
+
+    def filter(
+        self, league: League | None = None, division: int | None = None
+    ) -> list[ClanLeaderboardStats]:
+        """Get clans in a league, and optionally a division of it"""
+        if league is None:
+            clans = self.clans
+        else:
+            clans = self.by_league.get(league.value, [])
+
+        if division is not None:
+            clans = [i for i in clans if i.division == division]
+        return list(clans)
+
+
+class LeaderboardService:
+    """Current season ladders are kept fresh in memory. Ladders of finished
+    seasons never change, so are stored to disk and never fetched again."""
+
+    def __init__(self, path: pathlib.Path = LADDERS) -> None:
+        self.path: pathlib.Path = path
+        self.finished: set[int] = set()
+
+        # (Season, Realm): Ladder
+        self._current: TTLCache[tuple[int | None, str], Ladder]
+        self._current = TTLCache("cb_current", LADDER_TTL, 4 * len(REALMS))
+        # Finished seasons, (Season, Realm): Ladder
+        self._past: dict[tuple[int, str], Ladder] = dict()
+
+    def set_seasons(self, seasons: list[ClanBattleSeason]) -> None:
+        """Record which seasons have ended"""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.finished = {i.season_id for i in seasons if i.finish_time < now}
+
+    async def get(self, season: int | None, region: Region | None) -> Ladder:
+        """Get the ladder for a season, None for the current season"""
+        realm = region.realm if region is not None else "global"
+
+        if season is None or season not in self.finished:
+            return await self._current.get_or_fetch(
+                (season, realm), lambda: self._fetch(season, realm)
+            )
+
+        if (ladder := self._past.get((season, realm))) is None:
+            ladder = await asyncio.to_thread(self._load, season, realm)
+            if ladder is None:
+                ladder = await self._fetch(season, realm)
+                await asyncio.to_thread(self._save, ladder)
+            self._past[(season, realm)] = ladder
+        return ladder
+
+    async def refresh(self) -> None:
+        """Fetch the current season's ladder of every realm"""
+        for realm in REALMS:
+            try:
+                ladder = await self._fetch(None, realm)
+                self._current.set((None, realm), ladder)
+            except ConnectionError:
+                logger.error("Failed to refresh %s ladder", realm)
+
+    async def _fetch(self, season: int | None, realm: str) -> Ladder:
+        """Fetch and index a ladder from the API"""
+        raw = await fetch_cb_leaderboard_data(season, realm)
+        return Ladder(season, realm, raw)
+
+    def _file(self, season: int, realm: str) -> pathlib.Path:
+        return self.path / f"{season}-{realm}.json.gz"
+
+    def _load(self, season: int, realm: str) -> Ladder | None:
+        """Read a stored ladder from disk"""
+        try:
+            path = self._file(season, realm)
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                return Ladder(season, realm, json.load(file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.error("Unreadable ladder %s %s", season, realm)
+            return None
+
+    def _save(self, ladder: Ladder) -> None:
+        """Store a finished season's ladder to disk"""
+        assert ladder.season is not None
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self._file(ladder.season, ladder.realm)
+        tmp = file.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as out:
+            json.dump(ladder.raw, out, separators=(",", ":"))
+        tmp.replace(file)
+
+
+leaderboards = LeaderboardService()
@@ -1,9 +1,10 @@
 """Fetching Maps from the WoWs API"""
-import aiohttp
 import logging
+from typing import Any
 
 from pydantic import BaseModel
 
+from .client import get_client
 from .wg_id import WG_ID
 
 
@@ -35,14 +36,19 @@ class Map(BaseModel):
 
 
 async def get_maps() -> list[Map]:
+    try:
+        return parse_maps(await fetch_map_data())
+    except ConnectionError:
+        return []
+
+
+async def fetch_map_data() -> dict[str, Any]:
+    """Get the raw map data from the API"""
     params = {"application_id": WG_ID, "language": "en"}
-    async with aiohttp.ClientSession().get(MAPS, params=params) as resp:
-        if resp.status != 200:
-            logger.error("%s on %s", resp.status, MAPS)
-            return []
-        items = await resp.json()
-
-    out: list[Map] = []
-    for val in items["data"].values():
-        out.append(Map(**val))
-    return out
+    items = await get_client().get_json(MAPS, params)
+    return items.pop("data")
+
+
+def parse_maps(data: dict[str, Any]) -> list[Map]:
+    """Build Maps from raw API data"""
+    return [Map(**val) for val in data.values()]
@@ -1,9 +1,11 @@
 """Data retrieved from the Modules endpoint"""
+import asyncio
 import logging
+from typing import Any
 
-import aiohttp
 from pydantic import BaseModel, ValidationError
 
+from .client import get_client
 from .emojis import (
     ARTILLERY_EMOJI,
     AUXILIARY_EMOJI,
@@ -170,15 +172,33 @@ async def fetch_modules(modules: list[int]) -> dict[str, Module]:
     """Fetch Module Objects from the world of warships API"""
     module_id = ", ".join(str(i) for i in modules)
     params = {"application_id": WG_ID, "module_id": module_id}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(MODULES, params=params) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
-            data = await resp.json()
+    data = await get_client().get_json(MODULES, params)
+    return parse_modules(data["data"])
 
+
+async def fetch_module_data() -> dict[str, Any]:
+    """Get the raw data for every module from every page of the API"""
+    params = {"application_id": WG_ID, "limit": 100}
+
+    client = get_client()
+    raw: dict[str, Any] = dict()
+
+    async def get_page(count: int) -> int:
+        items = await client.get_json(MODULES, params | {"page_no": count})
+        meta: dict[str, int] = items.pop("meta")
+        raw.update(items["data"])
+        return meta["page_total"]
+
+    max_iter = await get_page(1)
+    # Fetch all remaiing pages simultaneously
+    await asyncio.gather(*[get_page(i) for i in range(2, max_iter + 1)])
+    return raw
+
+
+def parse_modules(data: dict[str, Any]) -> dict[str, Module]:
+    """Build Modules from raw API data, keyed by module ID"""
     output: dict[str, Module] = {}
-    for id_, data in data["data"].items():
+    for id_, data in data.items():
         try:
             output.update({id_: Module.parse_obj(data)})
         except ValidationError as err:
@@ -1,11 +1,13 @@
 """Information related to Players from the Wows API"""
 from __future__ import annotations
 
+import asyncio
 import datetime
 import logging
 
-import aiohttp
 from pydantic import BaseModel
+from ext.utils.cache import TTLCache
+from .client import get_client
 from .wg_id import WG_ID
 from .enums import Region
 from .clan import Clan, PartialClan
@@ -15,6 +17,14 @@ logger = logging.getLogger("api.player")
 
 PLAYER_STATS = "https://api.worldofwarships.%%/wows/account/info/"
 PLAYER_STATS_SHIP = "https://api.worldofwarships.%%/wows/ships/stats/"
+MAX_IDS = 100  # Maximum number of account_ids the API accepts at once
+
+# Account ID: Stats
+stats_cache: TTLCache[int, PlayerStats]
+stats_cache = TTLCache("player_stats", 10 * 60, 1024)
+# (Account ID, Ship ID or None for all ships): {Ship ID: Stats}
+ship_stats_cache: TTLCache[tuple[int, int | None], dict[str, PlayerShipStats]]
+ship_stats_cache = TTLCache("player_ship_stats", 10 * 60, 256)
 
 # For Generation of Embeds? Why is this here ...
 ARMAMENT_TYPES = [
@@ -44,56 +54,96 @@ MODE_STRINGS = [
 ]
 
 
+def account_region(account_id: int) -> Region:
+    """Get a Region object based on an account ID number."""
+    if 0 < account_id < 500000000:
+        raise ValueError("CIS Is no longer supported.")
+    elif 500000000 < account_id < 999999999:
+        return Region.EU
+    elif 1000000000 < account_id < 1999999999:
+        return Region.NA
+    else:
+        return Region.SEA
+
+
 async def fetch_player_stats(
     players: list[PartialPlayer],
 ) -> list[PlayerStats]:
     """Fetch Player Stats from API"""
-    ids = ", ".join([str(i.account_id) for i in players][:100])
-    parmas = {"application_id": WG_ID, "account_id": ids}
-
-    url = PLAYER_STATS.replace("%%", players[0].region.domain)
+    return await fetch_stats_by_id([i.account_id for i in players])
 
-    modes = MODE_STRINGS.copy()
-    extra = ", ".join(f"statistics.{i}" for i in modes)
-    parmas.update({"extra": extra})
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=parmas) as resp:
-            if resp.status != 200:
-                err = await resp.text()
-                logger.error("%s on %s -> %s", resp.status, url, err)
-                raise ConnectionError()
-            data = await resp.json()
+async def fetch_stats_by_id(account_ids: list[int]) -> list[PlayerStats]:
+    """Fetch stats for any number of accounts from any regions.
 
-    return [PlayerStats.parse_obj(i) for i in data.pop("data").values()]
+    Accounts are grouped by region and split into requests of MAX_IDS,
+    which are all sent at once. Accounts fetched recently are served from
+    stats_cache instead."""
+    cached: list[PlayerStats] = []
+    regions: dict[Region, list[int]] = dict()
+    for i in dict.fromkeys(account_ids):  # Dedupe, preserving order.
+        if (stats := stats_cache.get(i)) is not None:
+            stats_cache.hits += 1
+            cached.append(stats)
+        else:
+            stats_cache.misses += 1
+            regions.setdefault(account_region(i), []).append(i)
+
+    extra = ", ".join(f"statistics.{i}" for i in MODE_STRINGS)
+    client = get_client()
+
+    async def fetch_chunk(region: Region, ids: list[int]) -> list[PlayerStats]:
+        url = PLAYER_STATS.replace("%%", region.domain)
+        params = {
+            "application_id": WG_ID,
+            "account_id": ", ".join(str(i) for i in ids),
+            "extra": extra,
+        }
+        data = await client.get_json(url, params)
+
+        # Accounts that do not exist are returned as None.
+        values = data.pop("data").values()
+        output = [PlayerStats.parse_obj(i) for i in values if i is not None]
+        for stats in output:
+            stats_cache.set(stats.account_id, stats)
+        return output
+
+    chunks = [
+        fetch_chunk(region, ids[i : i + MAX_IDS])
+        for region, ids in regions.items()
+        for i in range(0, len(ids), MAX_IDS)
+    ]
+
+    results = await asyncio.gather(*chunks)
+    return cached + [stats for chunk in results for stats in chunk]
 
 
 async def fetch_player_ship_stats(
     player: PartialPlayer, ship: Ship | None = None
 ) -> dict[str, PlayerShipStats]:
     """Get stats for a player in a specific ship"""
-    url = PLAYER_STATS_SHIP.replace("%%", player.region.domain)
 
-    params = {
-        "application_id": WG_ID,
-        "account_id": player.account_id,
-        "extra": ", ".join(MODE_STRINGS),
-    }
-    if ship is not None:
-        params.update({"ship_id": ship.ship_id})
+    async def fetch() -> dict[str, PlayerShipStats]:
+        url = PLAYER_STATS_SHIP.replace("%%", player.region.domain)
+
+        params = {
+            "application_id": WG_ID,
+            "account_id": player.account_id,
+            "extra": ", ".join(MODE_STRINGS),
+        }
+        if ship is not None:
+            params.update({"ship_id": ship.ship_id})
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params) as resp:
-            if resp.status != 200:
-                logger.error(resp.status, await resp.text())
-            data = await resp.json()
+        data = await get_client().get_json(url, params)
+        data = data["data"][str(player.account_id)]
 
-    data = data["data"][str(player.account_id)]
+        statistics: dict[str, PlayerShipStats] = {}
+        for i in data:
+            statistics.update({i["ship_id"]: PlayerShipStats(**i)})
+        return statistics
 
-    statistics: dict[str, PlayerShipStats] = {}
-    for i in data:
-        statistics.update({i["ship_id"]: PlayerShipStats(**i)})
-    return statistics
+    key = (player.account_id, None if ship is None else ship.ship_id)
+    return dict(await ship_stats_cache.get_or_fetch(key, fetch))
 
 
 class PartialPlayer(BaseModel):
@@ -107,14 +157,7 @@ class PartialPlayer(BaseModel):
     @property
     def region(self) -> Region:
         """Get a Region object based on the player's ID number."""
-        if 0 < self.account_id < 500000000:
-            raise ValueError("CIS Is no longer supported.")
-        elif 500000000 < self.account_id < 999999999:
-            return Region.EU
-        elif 1000000000 < self.account_id < 1999999999:
-            return Region.NA
-        else:
-            return Region.SEA
+        return account_region(self.account_id)
 
     @property
     def community_link(self) -> str:
@@ -0,0 +1,184 @@
+"""A persistent cache of ShipProfiles for each ship & module combination"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import gzip
+import json
+import logging
+import pathlib
+from typing import TYPE_CHECKING, Any
+
+from pydantic import ValidationError
+
+from ext.utils.cache import TTLCache
+from .client import get_client
+from .shipparameters import ShipProfile
+from .wg_id import WG_ID
+
+if TYPE_CHECKING:
+    from .warships import Ship, ShipRegistry
+
+
+logger = logging.getLogger("api.profiles")
+
+SHIP_PROFILE = "https://api.worldofwarships.eu/wows/encyclopedia/shipprofile/"
+PROFILES = pathlib.Path("snapshots/profiles.json.gz")
+CACHE_SIZE = 4096  # Number of profiles kept, least recently used are evicted
+WARM_SHIPS = 50  # Number of most viewed ships to warm on a new game version
+
+# Ship ID, sorted module IDs, language
+ProfileKey = tuple[int, tuple[int, ...], str]
+
+# Module Type: API Parameter
+PARAMS = {
+    "Artillery": "artillery_id",
+    "DiveBomber": "dive_bomber_id",
+    "Engine": "engine_id",
+    "Fighter": "fighter_id",
+    "Suo": "fire_control_id",
+    "Hull": "hull_id",
+    "TorpedoBomber": "torpedo_bomber_id",
+    "Torpedoes": "torpedoes_id",
+}
+
+
+class ProfileCache(TTLCache[ProfileKey, ShipProfile]):
+    """ShipProfiles never change within a game version, so they never expire.
+
+    The whole cache is dropped when the game version changes."""
+
+    def __init__(self) -> None:
+        super().__init__("ship_profiles", float("inf"), CACHE_SIZE)
+        self.version: str | None = None
+        self.views: collections.Counter[int] = collections.Counter()
+
+    def reset(self, version: str) -> None:
+        """Drop every stored profile if the game version has changed"""
+        if version == self.version:
+            return
+
+        if self.version is not None:
+            logger.info("Game version %s, dropping profiles", version)
+            self._data.clear()
+        self.version = version
+
+    def load(self, path: pathlib.Path = PROFILES) -> None:
+        """Read stored profiles from disk"""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                data: dict[str, Any] = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.error("Discarding unreadable profiles %s", path)
+            return
+
+        self.version = data["version"]
+        self.views.update({int(k): v for k, v in data["views"].items()})
+        for ship_id, modules, language, profile in data["profiles"]:
+            try:
+                value = ShipProfile.parse_obj(profile)
+            except ValidationError:
+                continue
+            self.set((ship_id, tuple(modules), language), value)
+        logger.info("Loaded %s ship profiles", len(self._data))
+
+    async def save(self, path: pathlib.Path = PROFILES) -> None:
+        """Write the stored profiles to disk"""
+        # Copy on the event loop, so the cache can't change while writing.
+        profiles: list[list[Any]] = []
+        for (ship_id, modules, language), (_, value) in self._data.items():
+            profiles.append([ship_id, modules, language, value.dict()])
+
+        data = {
+            "version": self.version,
+            "views": dict(self.views),
+            "profiles": profiles,
+        }
+        await asyncio.to_thread(_write, path, data)
+
+    async def warm(self, ships: ShipRegistry, language: str = "en") -> None:
+        """Fetch stock and top configurations of the most viewed ships"""
+        count = 0
+        for ship_id, _ in self.views.most_common(WARM_SHIPS):
+            if (ship := ships.get(ship_id)) is None:
+                continue
+
+            for modules in (stock_modules(ship), top_modules(ship)):
+                if self.get(profile_key(ship, modules, language)):
+                    continue
+
+                try:
+                    await fetch_profile(ship, modules, language, view=False)
+                except ConnectionError:
+                    logger.error("Failed to warm profile for %s", ship.name)
+                    return
+                count += 1
+        logger.info("Warmed %s ship profiles", count)
+
+
+async def fetch_profile(
+    ship: Ship,
+    modules: dict[str, int],
+    language: str = "en",
+    view: bool = True,
+) -> ShipProfile:
+    """Get the profile of a ship with a set of {module type: module id}"""
+    if view:
+        profile_cache.views[ship.ship_id] += 1
+
+    async def fetch() -> ShipProfile:
+        params = {
+            "application_id": WG_ID,
+            "language": language,
+            "ship_id": ship.ship_id,
+        }
+        for k, val in modules.items():
+            try:
+                params.update({PARAMS[k]: str(val)})
+            except KeyError:
+                logger.error("Unable to convert %s to id field", k)
+
+        data = await get_client().get_json(SHIP_PROFILE, params)
+        return ShipProfile(**data["data"][str(ship.ship_id)])
+
+    key = profile_key(ship, modules, language)
+    return await profile_cache.get_or_fetch(key, fetch)
+
+
+def _write(path: pathlib.Path, data: dict[str, Any]) -> None:
+    """Atomically replace a gzipped json file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as file:
+        json.dump(data, file, separators=(",", ":"))
+    tmp.replace(path)
+
+
+def profile_key(
+    ship: Ship, modules: dict[str, int], language: str
+) -> ProfileKey:
+    """Profiles depend only on the ship, it's modules, and the language"""
+    return (ship.ship_id, tuple(sorted(modules.values())), language)
+
+
+def stock_modules(ship: Ship) -> dict[str, int]:
+    """The module of each type that a ship comes with"""
+    modules: dict[str, int] = dict()
+    for i in ship.modules_tree.values():
+        if i.is_default:
+            modules[i.type] = i.module_id
+    return modules
+
+
+def top_modules(ship: Ship) -> dict[str, int]:
+    """The most expensive researchable module of each type"""
+    modules: dict[str, tuple[int, int]] = dict()
+    for i in ship.modules_tree.values():
+        if i.type not in modules or i.price_xp > modules[i.type][0]:
+            modules[i.type] = (i.price_xp, i.module_id)
+    return {k: v[1] for k, v in modules.items()}
+
+
+profile_cache = ProfileCache()
@@ -0,0 +1,116 @@
+"""A versioned, compressed on-disk copy of the encyclopedia data"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import pathlib
+from typing import Any
+
+from .clan import ClanBattleSeason, fetch_cb_season_data, parse_cb_seasons
+from .gamemode import GameMode, fetch_game_mode_data, parse_game_modes
+from .maps import Map, fetch_map_data, parse_maps
+from .modules import Module, fetch_module_data, parse_modules
+from .warships import ShipRegistry, fetch_info, fetch_ship_data, parse_ships
+
+logger = logging.getLogger("api.snapshot")
+
+SNAPSHOT = pathlib.Path("snapshots/encyclopedia.json.gz")
+FORMAT = 2  # Bump when the layout of the snapshot changes.
+
+Parsed = tuple[
+    ShipRegistry,
+    list[GameMode],
+    list[Map],
+    list[ClanBattleSeason],
+    dict[str, Module],
+]
+
+
+class Encyclopedia:
+    """Raw encyclopedia responses for one game version"""
+
+    def __init__(
+        self,
+        version: str,
+        info: dict[str, Any],
+        ships: list[dict[str, Any]],
+        modes: dict[str, Any],
+        maps: dict[str, Any],
+        cb_seasons: dict[str, Any],
+        modules: dict[str, Any],
+    ) -> None:
+        self.version: str = version
+        self.info: dict[str, Any] = info
+        self.ships: list[dict[str, Any]] = ships
+        self.modes: dict[str, Any] = modes
+        self.maps: dict[str, Any] = maps
+        self.cb_seasons: dict[str, Any] = cb_seasons
+        self.modules: dict[str, Any] = modules
+
+    def __repr__(self) -> str:
+        return f"<Encyclopedia {self.version} ({len(self.ships)} ships)>"
+
+    def parse(self) -> Parsed:
+        """Build the API objects from the stored responses"""
+        return (
+            parse_ships(self.info, self.ships),
+            parse_game_modes(self.modes),
+            parse_maps(self.maps),
+            parse_cb_seasons(self.cb_seasons),
+            parse_modules(self.modules),
+        )
+
+
+async def fetch_version() -> str:
+    """Get the game version currently reported by the API"""
+    return (await fetch_info())["game_version"]
+
+
+async def fetch_encyclopedia() -> Encyclopedia:
+    """Download a fresh copy of every encyclopedia endpoint we store"""
+    info, ships, modes, maps, seasons, modules = await asyncio.gather(
+        fetch_info(),
+        fetch_ship_data(),
+        fetch_game_mode_data(),
+        fetch_map_data(),
+        fetch_cb_season_data(),
+        fetch_module_data(),
+    )
+    version = info["game_version"]
+    return Encyclopedia(version, info, ships, modes, maps, seasons, modules)
+
+
+def load_snapshot(path: pathlib.Path = SNAPSHOT) -> Encyclopedia | None:
+    """Read the snapshot from disk, or None if it is missing or unusable"""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            data: dict[str, Any] = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.error("Discarding unreadable snapshot %s", path, exc_info=True)
+        return None
+
+    if data.pop("format", None) != FORMAT:
+        logger.info("Discarding snapshot %s in an old format", path)
+        return None
+
+    try:
+        return Encyclopedia(**data)
+    except TypeError:
+        logger.error("Discarding malformed snapshot %s", path, exc_info=True)
+        return None
+
+
+def save_snapshot(enc: Encyclopedia, path: pathlib.Path = SNAPSHOT) -> None:
+    """Write the snapshot to disk, replacing any previous one atomically"""
+    data = {"format": FORMAT} | vars(enc)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as file:
+        json.dump(data, file, separators=(",", ":"))
+    tmp.replace(path)
+    logger.info("Saved encyclopedia snapshot for version %s", enc.version)
@@ -1,16 +1,17 @@
 """Discord transformers for various API entities"""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TypeAlias, TYPE_CHECKING
+from typing import Any, Coroutine, TypeAlias, TYPE_CHECKING, TypeVar
 
-import aiohttp
 from discord import Locale, Interaction as Itr
 from discord.app_commands import Choice, Transform, Transformer
 from pydantic import ValidationError
 
 from .wg_id import WG_ID
 from .clan import PartialClan
+from .client import get_client
 from .enums import Region
 from .gamemode import GameMode
 from .maps import Map
@@ -29,6 +30,14 @@ PLAYER_CLAN = "https://api.worldofwarships.%%/wows/clans/accountinfo/"
 
 logger = logging.getLogger("api.transformers")
 
+T = TypeVar("T")
+
+DEBOUNCE = 0.3  # Seconds to wait for another keystroke before searching
+AC_TIMEOUT = 2  # Seconds, discord expects autocompletes within three
+
+# User ID: their most recent autocomplete search
+_searches: dict[int, asyncio.Task[Any]] = dict()
+
 
 __all__ = [
     "clan_transform",
@@ -39,6 +48,40 @@ __all__ = [
 ]
 
 
+async def latest_search(
+    interaction: Interaction, coro: Coroutine[Any, Any, T]
+) -> T | None:
+    """Run a search, cancelling any the same user started before it.
+
+    Returns None if this search is itself superseded by a newer keystroke."""
+
+    async def debounced() -> T:
+        try:
+            await asyncio.sleep(DEBOUNCE)
+        except asyncio.CancelledError:
+            coro.close()  # Never started, so never awaited.
+            raise
+        return await coro
+
+    if (old := _searches.pop(interaction.user.id, None)) is not None:
+        old.cancel()
+
+    task = asyncio.create_task(debounced())
+    _searches[interaction.user.id] = task
+    try:
+        await asyncio.wait({task})
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        if _searches.get(interaction.user.id) is task:
+            del _searches[interaction.user.id]
+
+    if task.cancelled():
+        return None
+    return task.result()
+
+
 def get_locale(interaction: Interaction) -> str:
     """Convert an interaction's locale into API language field"""
     try:
@@ -83,10 +126,14 @@ class ClanTransformer(Transformer):
             "application_id": WG_ID,
         }
 
-        async with interaction.client.session.get(link, params=params) as resp:
-            if resp.status != 200:
-                logger.error("%s on %s", resp.status, link)
-            data = await resp.json()
+        search = get_client().get_json(
+            link, params, retries=0, timeout=AC_TIMEOUT
+        )
+        try:
+            if (data := await latest_search(interaction, search)) is None:
+                return []
+        except ConnectionError:
+            return []
 
         choices: list[Choice[str]] = []
 
@@ -115,18 +162,15 @@ class ClassTransformer(Transformer):
         /,
     ) -> list[Choice[str]]:
         """Autocomplete from list of classes of current ships"""
-        ships = interaction.client.ships
-        types = set(i.type.name.lower() for i in ships)
+        types = interaction.client.ships.types
         cur = current.lower()
-        return [Choice(name=i, value=i) for i in types if cur in i]
+        return [Choice(name=i, value=i) for i in types if cur in i.lower()]
 
     async def transform(  # type: ignore
         self, interaction: Interaction, value: str
     ) -> ShipType | None:
         """Get a shiptype"""
-        for i in interaction.client.ships:
-            if i.type.name == value:
-                return i.type
+        return interaction.client.ships.types.get(value)
 
 
 class MapTransformer(Transformer):
@@ -204,11 +248,14 @@ class PlayerTransformer(Transformer):
         region = next((i for i in Region if i.value == _), Region.EU)
 
         link = PLAYER_SEARCH.replace("%%", region.domain)
-        async with interaction.client.session.get(link, params=params) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                logger.error("%s %s: %s", resp.status, text, resp.url)
-            data = await resp.json()
+        search = get_client().get_json(
+            link, params, retries=0, timeout=AC_TIMEOUT
+        )
+        try:
+            if (data := await latest_search(interaction, search)) is None:
+                return []
+        except ConnectionError:
+            return []
 
         try:
             self.players = [PartialPlayer(**i) for i in data.pop("data", [])]
@@ -224,12 +271,16 @@ class PlayerTransformer(Transformer):
             "extra": "clan",
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(link, params=parms) as resp:
-                if resp.status != 200:
-                    logger.error("%s on %s", resp.status, link)
-                clan_raw = await resp.json()
-                clan_data = clan_raw.pop("data")
+        try:
+            clan_raw = await get_client().get_json(
+                link, parms, retries=0, timeout=AC_TIMEOUT
+            )
+        except ConnectionError:
+            return [
+                Choice(name=i.nickname, value=str(i.account_id))
+                for i in self.players
+            ]
+        clan_data = clan_raw.pop("data")
 
         logger.info("got %s clan_data items", len(clan_data))
         choices: list[Choice[str]] = []
@@ -268,7 +319,7 @@ class ShipTransformer(Transformer):
 
         current = current.casefold()
         choices: list[Choice[str]] = []
-        for i in sorted(interaction.client.ships, key=lambda i: i.name):
+        for i in interaction.client.ships:
             if not i.ship_id_str:
                 continue
 
@@ -288,8 +339,7 @@ class ShipTransformer(Transformer):
         self, interaction: Interaction, value: str, /
     ) -> Ship:
         """Retrieve the ship object for the selected autocomplete"""
-        ships = interaction.client.ships
-        return next(i for i in ships if i.ship_id_str == value)
+        return interaction.client.ships.by_id_str[value]
 
 
 class RegionTransformer(Transformer):
@@ -3,9 +3,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+from typing import Any, Iterator
 
-import aiohttp
 from pydantic import BaseModel, ValidationError
 
 from ext.wows_api.modules import Module
@@ -27,7 +26,9 @@ from .emojis import (
     SUBMARINE_PREMIUM_EMOJI,
     SUBMARINE_SPECIAL_EMOJI,
 )
+from .client import get_client
 from .enums import Nation
+from .profiles import fetch_profile
 from .shipparameters import ShipProfile
 from .wg_id import WG_ID
 
@@ -36,73 +37,64 @@ logger = logging.getLogger("api.ship")
 
 
 INFO = "https://api.worldofwarships.eu/wows/encyclopedia/info/"
-SHIP_PROFILE = "https://api.worldofwarships.eu/wows/encyclopedia/shipprofile/"
 SHIPS = "https://api.worldofwarships.eu/wows/encyclopedia/ships/"
 
 
-async def get_ships() -> list[Ship]:
-    """Cache the ships from the API."""
+async def fetch_info() -> dict[str, Any]:
+    """Get the raw encyclopedia info, including the current game version"""
+    params = {"application_id": WG_ID, "language": "en"}
+    data = await get_client().get_json(INFO, params)
+    return data.pop("data")
+
+
+async def fetch_ship_data() -> list[dict[str, Any]]:
+    """Get the raw data for every ship from every page of the API"""
     _ = {"application_id": WG_ID, "language": "en"}
     params: dict[str, Any] = _
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(INFO, params=params) as resp:
-            if resp.status != 200:
-                rsn = await resp.text()
-                logger.error("%s %s: %s", resp.status, rsn, INFO)
-            data = await resp.json()
-
-        types: list[ShipType] = []
-        for k, val in data["data"]["ship_types"].items():
-            images: dict[str, Any] = data["data"]["ship_type_images"][k]
-            images.update({"name": val})
-            images.update({"api_name": k})
-            types.append(ShipType.parse_obj(images))
-
-        params.update({"page_no": 1})
-        ships: list[Ship] = []
-
-        async def get_page(count: int, session: aiohttp.ClientSession) -> int:
-            params.update({"page_no": count})
-            async with session.get(SHIPS, params=params) as resp:
-                if resp.status != 200:
-                    rsn = await resp.text()
-                    logger.error("%s %s: %s", resp.status, rsn, resp.url)
-                items = await resp.json()
-
-            meta: dict[str, int] = items.pop("meta")
-
-            for data in items["data"].values():
-                # Get from Resolved Ship Types.
-                _type = data["type"]
-                data["type"] = next(i for i in types if i.api_name == _type)
-
-                try:
-                    ship = Ship(**data)
-                except ValidationError as err:
-                    logger.error(err)
-                    continue
-
-                ships.append(ship)
-            return meta["page_total"]
+    client = get_client()
+    raw: list[dict[str, Any]] = []
 
-        max_iter = await get_page(1, session)
-        # Fetch all remaiing pages simultaneously
-        await asyncio.gather(
-            *[get_page(i, session) for i in range(2, max_iter + 1)]
-        )
+    async def get_page(count: int) -> int:
+        items = await client.get_json(SHIPS, params | {"page_no": count})
+        meta: dict[str, int] = items.pop("meta")
+        raw.extend(items["data"].values())
+        return meta["page_total"]
 
-    for i in ships:
-        for id_, cost in i.next_ships.items():
-            try:
-                nxt = next(k for k in ships if k.ship_id == id_)
-            except StopIteration:
-                continue
-            i.next_ship_objects.append((nxt, cost))
+    max_iter = await get_page(1)
+    # Fetch all remaiing pages simultaneously
+    await asyncio.gather(*[get_page(i) for i in range(2, max_iter + 1)])
+    return raw
 
-        i.previous_ships = [j for j in ships if i.ship_id in j.next_ships]
 
-    return ships
+async def get_ships() -> ShipRegistry:
+    """Cache the ships from the API."""
+    info, raw = await asyncio.gather(fetch_info(), fetch_ship_data())
+    return parse_ships(info, raw)
+
+
+def parse_ships(
+    info: dict[str, Any], raw: list[dict[str, Any]]
+) -> ShipRegistry:
+    """Build Ship objects from raw encyclopedia info and ship data"""
+    types: dict[str, ShipType] = dict()
+    for k, val in info["ship_types"].items():
+        images: dict[str, Any] = dict(info["ship_type_images"][k])
+        images.update({"name": val})
+        images.update({"api_name": k})
+        types[k] = ShipType.parse_obj(images)
+
+    ships: list[Ship] = []
+    for data in raw:
+        # Get from Resolved Ship Types, without altering the raw data.
+        try:
+            ship = Ship(**data | {"type": types[data["type"]]})
+        except (KeyError, ValidationError) as err:
+            logger.error(err)
+            continue
+        ships.append(ship)
+
+    return ShipRegistry(ships)
 
 
 class ShipType(BaseModel):
@@ -234,17 +226,93 @@ class Ship(BaseModel):
         return f"{self.name} (Tier {self.tier} {self.nation.sane} {_})"
 
 
+class ShipRegistry:
+    """Every ship, indexed by id and by the filters we search with.
+
+    Iterating the registry yields ships sorted by name."""
+
+    def __init__(self, ships: list[Ship]) -> None:
+        self.ships: list[Ship] = sorted(ships, key=lambda i: i.name)
+
+        self.by_id: dict[int, Ship] = {i.ship_id: i for i in self.ships}
+        self.by_id_str: dict[str, Ship] = dict()
+        self.by_tier: dict[int, list[Ship]] = dict()
+        self.by_class: dict[str, list[Ship]] = dict()
+        self.by_nation: dict[Nation, list[Ship]] = dict()
+        self.types: dict[str, ShipType] = dict()
+
+        for i in self.ships:
+            if i.ship_id_str:
+                self.by_id_str[i.ship_id_str] = i
+            self.by_tier.setdefault(i.tier, []).append(i)
+            self.by_class.setdefault(i.type.name, []).append(i)
+            self.by_nation.setdefault(i.nation, []).append(i)
+            self.types.setdefault(i.type.name, i.type)
+
+        self._link()
+
+    def __iter__(self) -> Iterator[Ship]:
+        return iter(self.ships)
+
+    def __len__(self) -> int:
+        return len(self.ships)
+
+    def __repr__(self) -> str:
+        return f"<ShipRegistry ({len(self.ships)} ships)>"
+
+    def _link(self) -> None:
+        """Resolve the tech tree into next & previous ship objects"""
+        for i in self.ships:
+            i.next_ship_objects = []
+            i.previous_ships = []
+
+        for i in self.ships:
+            for id_, cost in i.next_ships.items():
+                if (nxt := self.by_id.get(id_)) is None:
+                    continue
+                i.next_ship_objects.append((nxt, cost))
+                nxt.previous_ships.append(i)
+
+    def get(self, ship_id: int | None) -> Ship | None:
+        """Get a ship by it's ID"""
+        return None if ship_id is None else self.by_id.get(ship_id)
+
+    def filter(
+        self,
+        tier: int | None = None,
+        class_: ShipType | None = None,
+        nation: Nation | None = None,
+    ) -> list[Ship]:
+        """Get all ships matching every given filter"""
+        indexes: list[list[Ship]] = []
+        if tier is not None:
+            indexes.append(self.by_tier.get(tier, []))
+        if class_ is not None:
+            indexes.append(self.by_class.get(class_.name, []))
+        if nation is not None:
+            indexes.append(self.by_nation.get(nation, []))
+
+        if not indexes:
+            return list(self.ships)
+
+        # Start from the smallest index, and check the rest by ID.
+        indexes.sort(key=len)
+        ids = [set(i.ship_id for i in index) for index in indexes[1:]]
+        return [i for i in indexes[0] if all(i.ship_id in j for j in ids)]
+
+
 class ShipFit:
     """A Ship Fitting"""
 
     ship: Ship
 
-    modules: dict[str, Module] = {}
+    modules: dict[str, Module]
 
     profile: ShipProfile
 
     def __init__(self, ship: Ship, initial_modules: list[Module]) -> None:
         self.ship = ship
+        self.modules = dict()
 
         for i in initial_modules:
             self.set_module(i)
@@ -257,30 +325,6 @@ class ShipFit:
 
     async def get_params(self, language: str = "en") -> ShipProfile:
         """Fetch the ship's parameters with the current fitting"""
-        params = {"application_id": WG_ID, "language": language}
-
-        convert = {
-            "Artillery": "artillery_id",
-            "DiveBomber" "Hull": "dive_bomber_id",
-            "Engine": "engine_id",
-            "Fighter": "fighter_id",
-            "Suo": "fire_control_id",
-            "Hull": "hull_id",
-            "TorpedoBomber": "torpedo_bomber_id",
-            "Torpedoes": "torpedoes_id",
-        }
-        for i in self.modules.values():
-            try:
-                params.update({convert[i.type]: str(i.module_id)})
-            except KeyError:
-                logger.error("Unable to convert %s to id field", i.type)
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(SHIP_PROFILE, params=params) as resp:
-                if resp.status != 200:
-                    rsn = await resp.text()
-                    logger.error("%s %s: %s", resp.status, rsn, resp.url)
-                data = await resp.json()
-
-        self.profile = ShipProfile(**data)
+        modules = {k: v.module_id for k, v in self.modules.items()}
+        self.profile = await fetch_profile(self.ship, modules, language)
         return self.profile
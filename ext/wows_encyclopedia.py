@@ -1,13 +1,22 @@
 """Module for working with the encyclopedia endpoint of the wows API"""
 from __future__ import annotations
 
+import asyncio
 import logging
 import typing
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 import ext.wows_api as api
+from ext.wows_api.profiles import profile_cache
+from ext.wows_api.snapshot import (
+    Encyclopedia as Snapshot,
+    fetch_encyclopedia,
+    fetch_version,
+    load_snapshot,
+    save_snapshot,
+)
 
 if typing.TYPE_CHECKING:
     from painezbot import PBot
@@ -25,10 +34,54 @@ class Encyclopedia(commands.Cog):
 
     def __init__(self, bot: PBot) -> None:
         self.bot = bot
+        self.version: str | None = None
+        self.task: asyncio.Task[None] | None = None
 
     async def cog_load(self) -> None:
-        self.bot.modes = await api.get_game_modes()
-        self.bot.maps = await api.get_maps()
+        """Load the stored encyclopedia, then check for a new game version"""
+        await asyncio.to_thread(profile_cache.load)
+        if (snap := await asyncio.to_thread(load_snapshot)) is not None:
+            await self.apply(snap)
+        self.task = self.version_loop.start()
+
+    async def cog_unload(self) -> None:
+        """Stop checking for new game versions"""
+        if self.task is not None:
+            self.task.cancel()
+        await profile_cache.save()
+
+    async def apply(self, snap: Snapshot) -> None:
+        """Store the encyclopedia objects from a snapshot to the bot"""
+        parsed = await asyncio.to_thread(snap.parse)
+        ships, modes, maps, seasons, modules = parsed
+        self.bot.ships = ships
+        self.bot.modes = modes
+        self.bot.maps = maps
+        self.bot.clan_battle_seasons = seasons
+        self.bot.modules.update(modules)
+        profile_cache.reset(snap.version)
+        self.version = snap.version
+        logger.info("Loaded encyclopedia for game version %s", snap.version)
+
+    @tasks.loop(hours=1)
+    async def version_loop(self) -> None:
+        """Only re-download the encyclopedia when the game version changes"""
+        try:
+            version = await fetch_version()
+            if version == self.version:
+                await profile_cache.save()
+                return
+
+            snap = await fetch_encyclopedia()
+        except ConnectionError:
+            logger.error("Failed to update the encyclopedia", exc_info=True)
+            return
+
+        await asyncio.to_thread(save_snapshot, snap)
+        await self.apply(snap)
+
+        await profile_cache.warm(self.bot.ships)
+        await profile_cache.save()
 
     @discord.app_commands.command(name="map")
     @discord.app_commands.describe(obj="Search for a map by name")
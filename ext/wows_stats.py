@@ -241,8 +241,7 @@ class StatsView(view_utils.BaseView):
             ship_id = val.max_frags_ship_id
             record = val.max_frags_battle
             if self.ship is None and record:
-                ship = next((i for i in ships if i.ship_id == ship_id), None)
-                if ship is None:
+                if (ship := ships.get(ship_id)) is None:
                     shp = ""
                 else:
                     emote = ship.emoji
@@ -325,8 +324,7 @@ class StatsView(view_utils.BaseView):
             _ += f" ({format(round(val), ',')})\n"  # Total
 
             if record:
-                ship = next((i for i in ships if i.ship_id == ship_id), None)
-                if ship is None:
+                if (ship := ships.get(ship_id)) is None:
                     shp = ""
                 else:
                     emote = ship.emoji
@@ -12,7 +12,10 @@ import asyncpg
 import discord
 from discord.ext import commands
 
-from ext.utils.playwright_browser import make_browser
+from ext.utils.dispatcher import Dispatcher
+from ext.utils.playwright_browser import PagePool, make_browser
+from ext.wows_api.client import get_client
+from ext.wows_api.warships import ShipRegistry
 
 if TYPE_CHECKING:
     from playwright.async_api import BrowserContext
@@ -20,7 +23,6 @@ if TYPE_CHECKING:
     from ext.news_tracker import Article, NewsChannel
 
     import ext.wows_api as api
-    from ext.wows_api.warships import Ship
 
 
 with open("credentials.json", encoding="utf-8") as fun:
@@ -82,20 +84,25 @@ class PBot(commands.AutoShardedBot):
 
         # RSS: Cache & Channels
         self.news: asyncio.Task[None]
-        self.news_cache: list[Article] = []
+        self.news_cache: dict[str, Article] = dict()
         self.news_channels: list[NewsChannel] = []
 
+        # Sends to tracker channels
+        self.dispatcher: Dispatcher = Dispatcher()
+
         # Session // Scraping
         self.browser: BrowserContext
+        self.page_pool: PagePool
         self.session: aiohttp.ClientSession
 
         # Wows
-        self.clan_battle_seasons: list[api.ClanBattleSeason]
+        self.wg: api.WGClient
+        self.clan_battle_seasons: list[api.ClanBattleSeason] = []
         self.clan_battle_winners: dict[int, list[api.ClanBattleWinner]]
         self.maps: list[api.Map] = []
         self.modes: list[api.GameMode] = []
         self.modules: dict[str, api.Module] = dict()
-        self.ships: list[Ship] = []
+        self.ships: ShipRegistry = ShipRegistry([])
 
         # Announce aliveness
         started = self.initialised_at.strftime("%d-%m-%Y %H:%M:%S")
@@ -111,6 +118,12 @@ class PBot(commands.AutoShardedBot):
 
         # playwright
         self.browser = await make_browser()
+        self.page_pool = PagePool(self.browser)
+
+        # Wargaming API
+        self.wg = get_client()
+
+        self.dispatcher.start()
 
         for i in COGS:
             try:
@@ -137,6 +150,8 @@ async def run() -> None:
             await bot.unload_extension(i)
 
         await bot.db.close()
+        await bot.wg.close()
+        await bot.dispatcher.close()
         await bot.close()
 
 
@@ -0,0 +1,87 @@
+"""Leases of pooled browser pages by interactive views"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+discord = pytest.importorskip("discord")
+fixtures = pytest.importorskip("ext.fixtures")
+
+from ext.utils.playwright_browser import PagePool  # noqa: E402
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def goto(self, url: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    async def new_page(self) -> FakePage:
+        return FakePage()
+
+
+class FakeResponse:
+    async def defer(self, **kwargs: object) -> None:
+        pass
+
+    def is_done(self) -> bool:
+        return True
+
+
+class FakeInteraction:
+    def __init__(self) -> None:
+        self.user = None
+        self.response = FakeResponse()
+        self.view: discord.ui.View | None = None
+
+    async def edit_original_response(self, **kwargs: object) -> None:
+        self.view = kwargs.get("view")  # type: ignore
+
+
+def test_news_releases_page(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The FSView built by /news is never sent, so the paginator shown in
+    its place must release its page when it times out"""
+    fs = fixtures.fs
+
+    async def get_news(self: object, page: object) -> list[object]:
+        return []
+
+    async def create(obj: object) -> discord.Embed:
+        return discord.Embed()
+
+    async def handle_buttons(self: object) -> None:
+        pass
+
+    monkeypatch.setattr(fixtures, "reload", lambda module: module)
+    monkeypatch.setattr(fs.Team, "get_news", get_news)
+    monkeypatch.setattr(fixtures.FSEmbed, "create", staticmethod(create))
+    monkeypatch.setattr(fixtures.FSView, "handle_buttons", handle_buttons)
+
+    async def run() -> None:
+        pool = PagePool(FakeBrowser())  # type: ignore
+        cog = SimpleNamespace(bot=SimpleNamespace(page_pool=pool))
+        team = fs.abc.BaseTeam(name="Team", id="abc", url="https://a.b/c")
+
+        interaction = FakeInteraction()
+        await fixtures.FixturesCog.news.callback(cog, interaction, team)
+        assert len(pool._leased) == 1
+
+        paginator = interaction.view
+        assert isinstance(paginator, fixtures.EmbedPaginator)
+        await paginator.on_timeout()
+
+        assert not pool._leased
+        assert len(pool._idle) == 1
+
+    asyncio.run(run())